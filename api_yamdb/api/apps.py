@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        # Обработчики сигналов, помечающие устаревшие снимки каталога
+        from . import snapshots  # noqa: F401
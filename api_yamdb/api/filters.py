@@ -1,5 +1,6 @@
 import django_filters
-from reviews.models import Title
+from reviews.dictionaries import categories, genres
+from reviews.models import GenreTitle, Title
 
 
 class TitlesFilter(django_filters.FilterSet):
@@ -7,15 +8,23 @@ class TitlesFilter(django_filters.FilterSet):
         field_name='name',
         lookup_expr='icontains'
     )
-    category = django_filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='icontains'
-    )
-    genre = django_filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='icontains'
-    )
+    # Подстрока slug ищется в справочнике, без соединения с таблицами
+    # категорий и жанров
+    category = django_filters.CharFilter(method='filter_category')
+    genre = django_filters.CharFilter(method='filter_genre')
 
     class Meta:
         model = Title
         fields = ['name', 'year', 'genre', 'category']
+
+    def filter_category(self, queryset, name, value):
+        return queryset.filter(
+            category_id__in=categories.pks_containing(value)
+        )
+
+    def filter_genre(self, queryset, name, value):
+        # Подзапрос, а не JOIN: произведение с несколькими подходящими
+        # жанрами не должно повторяться в выдаче
+        return queryset.filter(pk__in=GenreTitle.objects.filter(
+            genre_id__in=genres.pks_containing(value)
+        ).values('title_id'))
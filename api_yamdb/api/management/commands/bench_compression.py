@@ -0,0 +1,79 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api.row_serializers import (
+    CommentRowSerializer,
+    ReviewRowSerializer,
+    TitleRowSerializer,
+)
+from api_yamdb.middleware import compress_string
+from .bench_list_render import build_page
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает уровни сжатия gzip на типичных страницах API: '
+        'сэкономленные байты против процессорного времени.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-sizes', type=int, nargs='+',
+            default=[1, settings.REST_FRAMEWORK['PAGE_SIZE'], 50],
+        )
+        parser.add_argument(
+            '--levels', type=int, nargs='+', default=[1, 3, 5, 6, 9]
+        )
+        parser.add_argument('--iterations', type=int, default=500)
+
+    def render_pages(self, size):
+        """Тела ответов списков в том виде, в каком их отдаёт API."""
+        renderer = JSONRenderer()
+        page = build_page(size)
+        serializers = {
+            'titles': TitleRowSerializer(),
+            'reviews': ReviewRowSerializer(),
+            'comments': CommentRowSerializer(),
+        }
+        for name, row_serializer in serializers.items():
+            _, rows, genre_rows = page[name]
+            data = [row_serializer.row_to_dict(row) for row in rows]
+            if genre_rows is not None:
+                row_serializer.attach_genres(data, genre_rows)
+            yield name, renderer.render({
+                'count': size, 'next': None, 'previous': None,
+                'results': data,
+            })
+
+    def measure(self, content, level, iterations):
+        started = time.process_time()
+        for _ in range(iterations):
+            compressed = compress_string(content, level)
+        elapsed = (time.process_time() - started) / iterations * 1e6
+        return len(compressed), elapsed
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'Порог GZIP_MIN_LENGTH={settings.GZIP_MIN_LENGTH} байт, '
+            f'уровень GZIP_LEVEL={settings.GZIP_LEVEL}'
+        )
+        for size in options['page_sizes']:
+            for name, content in self.render_pages(size):
+                self.stdout.write(
+                    f'{name}, {size} на стр.: {len(content)} байт'
+                    + (' (меньше порога, не сжимается)'
+                       if len(content) < settings.GZIP_MIN_LENGTH else '')
+                )
+                for level in options['levels']:
+                    compressed, elapsed = self.measure(
+                        content, level, options['iterations']
+                    )
+                    saved = len(content) - compressed
+                    self.stdout.write(
+                        f'    уровень {level}: {compressed} байт '
+                        f'(-{saved / len(content):.0%}), {elapsed:.1f} мкс, '
+                        f'{saved / elapsed:.0f} байт/мкс'
+                    )
@@ -0,0 +1,64 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand
+
+
+def fetch(url, timeout):
+    started = time.perf_counter()
+    try:
+        with urlopen(url, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except HTTPError as error:
+        status = error.code
+    except (URLError, OSError):
+        status = None
+    return status, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает запущенный сервер параллельными GET-запросами и выводит '
+        'пропускную способность и задержки. Запускается против sync '
+        '(api_yamdb.wsgi) и ASGI (api_yamdb.asgi) режимов для сравнения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'urls', nargs='+',
+            help='Адреса, например http://127.0.0.1:8000/api/v1/titles/'
+        )
+        parser.add_argument('--concurrency', type=int, default=200)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--timeout', type=float, default=30)
+
+    def handle(self, *args, **options):
+        urls = options['urls']
+        total = options['requests']
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            started = time.perf_counter()
+            results = list(pool.map(
+                lambda number: fetch(
+                    urls[number % len(urls)], options['timeout']
+                ),
+                range(total)
+            ))
+            elapsed = time.perf_counter() - started
+        latencies = sorted(latency for _, latency in results)
+        errors = sum(1 for status, _ in results if status != 200)
+
+        def percentile(share):
+            return latencies[min(len(latencies) - 1,
+                                 int(len(latencies) * share))] * 1000
+
+        self.stdout.write(
+            f'запросов: {total}, параллельно: {options["concurrency"]}, '
+            f'ошибок: {errors}\n'
+            f'пропускная способность: {total / elapsed:.1f} запр./с\n'
+            f'задержка p50: {percentile(0.5):.1f} мс, '
+            f'p95: {percentile(0.95):.1f} мс, '
+            f'p99: {percentile(0.99):.1f} мс'
+        )
@@ -0,0 +1,119 @@
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.row_serializers import (
+    CommentRowSerializer,
+    ReviewRowSerializer,
+    TitleRowSerializer,
+)
+from api.serializers import (
+    CommentSerializer,
+    ReviewSerializer,
+    TitleGetSerializer,
+)
+from reviews.dictionaries import categories, genres
+
+
+def build_page(size):
+    """Синтетическая страница: объекты для DRF и кортежи для быстрого пути.
+
+    Справочники категорий и жанров заполняются синтетическими записями.
+    """
+    start = timezone.make_aware(datetime(2022, 1, 1), timezone.utc)
+    categories.load([(1, 'movie', 'Фильмы')], categories.shared_version())
+    genres.load(
+        [(pk, f'genre-{pk}', f'Жанр {pk}') for pk in range(1, 4)],
+        genres.shared_version()
+    )
+    genre_links = [SimpleNamespace(genre_id=pk) for pk in range(1, 4)]
+    titles, title_rows, genre_rows = [], [], []
+    reviews, review_rows = [], []
+    comments, comment_rows = [], []
+    for pk in range(1, size + 1):
+        author = SimpleNamespace(username=f'user{pk}')
+        pub_date = start + timedelta(minutes=pk)
+        titles.append(SimpleNamespace(
+            id=pk, name=f'Произведение {pk}', year=2000 + pk % 20,
+            score=7.5, description='Описание', category_id=1,
+            genretitle_set=SimpleNamespace(all=lambda: genre_links),
+        ))
+        title_rows.append(
+            (pk, f'Произведение {pk}', 2000 + pk % 20, 7.5, 'Описание', 1)
+        )
+        genre_rows.extend((pk, link.genre_id) for link in genre_links)
+        reviews.append(SimpleNamespace(
+            id=pk, text='Текст отзыва ' * 10, author=author, score=8,
+            pub_date=pub_date,
+        ))
+        review_rows.append(
+            (pk, 'Текст отзыва ' * 10, author.username, 8, pub_date)
+        )
+        comments.append(SimpleNamespace(
+            id=pk, text='Комментарий', author=author, pub_date=pub_date,
+        ))
+        comment_rows.append((pk, 'Комментарий', author.username, pub_date))
+    return {
+        'titles': (titles, title_rows, genre_rows),
+        'reviews': (reviews, review_rows, None),
+        'comments': (comments, comment_rows, None),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает процессорное время отрисовки страницы списка '
+        'сериализаторами DRF и быстрыми построителями строк.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-size', type=int,
+            default=settings.REST_FRAMEWORK['PAGE_SIZE'],
+        )
+        parser.add_argument('--iterations', type=int, default=2000)
+
+    def measure(self, render, iterations):
+        started = time.process_time()
+        for _ in range(iterations):
+            render()
+        return (time.process_time() - started) / iterations * 1e6
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        page = build_page(options['page_size'])
+        pairs = {
+            'titles': (TitleGetSerializer, TitleRowSerializer()),
+            'reviews': (ReviewSerializer, ReviewRowSerializer()),
+            'comments': (CommentSerializer, CommentRowSerializer()),
+        }
+        for name, (serializer_class, row_serializer) in pairs.items():
+            objects, rows, genre_rows = page[name]
+
+            def drf():
+                return renderer.render(
+                    serializer_class(objects, many=True).data
+                )
+
+            def fast():
+                data = [row_serializer.row_to_dict(row) for row in rows]
+                if genre_rows is not None:
+                    row_serializer.attach_genres(data, genre_rows)
+                return renderer.render(data)
+
+            if drf() != fast():
+                self.stderr.write(f'{name}: вывод отличается!')
+                continue
+            slow_us = self.measure(drf, options['iterations'])
+            fast_us = self.measure(fast, options['iterations'])
+            self.stdout.write(
+                f'{name}: DRF {slow_us:.1f} мкс/стр., '
+                f'быстрый путь {fast_us:.1f} мкс/стр., '
+                f'экономия {slow_us - fast_us:.1f} мкс '
+                f'(x{slow_us / fast_us:.1f})'
+            )
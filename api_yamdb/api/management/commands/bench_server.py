@@ -0,0 +1,106 @@
+import os
+import signal
+import subprocess
+import time
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+MODES = {
+    'sync': {'GUNICORN_WORKER_CLASS': 'sync', 'GUNICORN_PRELOAD': 'False'},
+    'sync-preload': {'GUNICORN_WORKER_CLASS': 'sync'},
+    'gthread-preload': {'GUNICORN_WORKER_CLASS': 'gthread'},
+    'uvicorn-preload': {'GUNICORN_WORKER_CLASS': 'uvicorn'},
+}
+
+
+def children(pid):
+    """Дочерние процессы (воркеры) по /proc."""
+    result = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as stat:
+                parent = int(stat.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if parent == pid:
+            result.append(int(entry))
+    return result
+
+
+def memory_kb(pid):
+    """Rss и Pss процесса: Pss учитывает разделяемые после форка страницы."""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as smaps:
+        for line in smaps:
+            key, _, rest = line.partition(':')
+            if key in ('Rss', 'Pss'):
+                values[key] = int(rest.split()[0])
+    return values
+
+
+class Command(BaseCommand):
+    help = (
+        'Запускает gunicorn с gunicorn.conf.py в разных режимах и сравнивает '
+        'время запуска и память мастера и воркеров (только Linux).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--modes', nargs='+', choices=MODES, default=list(MODES)
+        )
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--port', type=int, default=8099)
+        parser.add_argument('--path', default='/api/v1/categories/')
+
+    def run_mode(self, mode, options):
+        env = dict(
+            os.environ,
+            GUNICORN_BIND=f'127.0.0.1:{options["port"]}',
+            GUNICORN_WORKERS=str(options['workers']),
+            **MODES[mode]
+        )
+        url = f'http://127.0.0.1:{options["port"]}{options["path"]}'
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            ['gunicorn', '-c', 'gunicorn.conf.py'],
+            cwd=settings.BASE_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            while True:
+                try:
+                    urlopen(url, timeout=1).read()
+                    break
+                except (URLError, OSError):
+                    if server.poll() is not None:
+                        raise RuntimeError(f'{mode}: gunicorn не запустился')
+                    time.sleep(0.05)
+            ready = time.perf_counter() - started
+            # Ждём, пока поднимутся все воркеры, и прогреваем их.
+            while len(children(server.pid)) < options['workers']:
+                time.sleep(0.05)
+            for _ in range(options['workers'] * 10):
+                urlopen(url, timeout=5).read()
+            pids = [server.pid] + children(server.pid)
+            total = {'Rss': 0, 'Pss': 0}
+            for pid in pids:
+                for key, value in memory_kb(pid).items():
+                    total[key] += value
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait()
+        return ready, total
+
+    def handle(self, *args, **options):
+        for mode in options['modes']:
+            ready, total = self.run_mode(mode, options)
+            self.stdout.write(
+                f'{mode}: готов за {ready:.2f} с, '
+                f'Rss {total["Rss"] / 1024:.1f} МБ, '
+                f'Pss {total["Pss"] / 1024:.1f} МБ'
+            )
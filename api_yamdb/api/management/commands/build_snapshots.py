@@ -0,0 +1,61 @@
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.models import SnapshotChange
+from api.snapshots import SnapshotBuilder
+
+
+class Command(BaseCommand):
+    help = (
+        'Строит JSON-снимки первых страниц категорий, жанров и произведений '
+        'для отдачи анонимным клиентам через nginx. По умолчанию '
+        'перестраивает только группы, затронутые изменениями каталога.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Перестроить все снимки, а не только устаревшие.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, проверяя изменения каталога.'
+        )
+        parser.add_argument('--interval', type=float, default=5)
+
+    def rebuild(self, builder, full):
+        changes = list(
+            SnapshotChange.objects.values_list('pk', 'key', 'version')
+        )
+        if not full and not changes and builder.load_manifest() is not None:
+            return
+        started = time.perf_counter()
+        groups = builder.build(
+            None if full else [key for _, key, _ in changes]
+        )
+        # Удаляем только после успешной сборки: при ошибке пометки
+        # останутся до следующего запуска. Пометки, повторённые после
+        # чтения, получили новую version и тоже останутся.
+        read = defaultdict(list)
+        for pk, _, version in changes:
+            read[version].append(pk)
+        for version, pks in read.items():
+            SnapshotChange.objects.filter(pk__in=pks, version=version).delete()
+        self.stdout.write(
+            f'Перестроено групп снимков: {groups} '
+            f'за {time.perf_counter() - started:.2f} с'
+        )
+
+    def handle(self, *args, **options):
+        builder = SnapshotBuilder(
+            settings.SNAPSHOT_DIR,
+            settings.SNAPSHOT_PAGES,
+            settings.SNAPSHOT_BASE_URL
+        )
+        self.rebuild(builder, full=options['full'])
+        while options['loop']:
+            time.sleep(options['interval'])
+            self.rebuild(builder, full=False)
@@ -0,0 +1,70 @@
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Выполняется в отдельном интерпретаторе: то же, что делает воркер
+# gunicorn до первого запроса, плюс загрузка URLconf (а с ним и вьюх).
+CHILD = '''
+import os, resource, sys, time
+started = time.perf_counter()
+os.environ['DJANGO_SETTINGS_MODULE'] = sys.argv[1]
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(time.perf_counter() - started,
+      resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+      len(sys.modules))
+'''
+
+
+def top_imports(importtime_log, limit):
+    """Самые долгие импорты верхнего уровня из вывода -X importtime."""
+    imports = []
+    for line in importtime_log.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  ') and name.strip():
+            imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)[:limit]
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет время импорта, пиковый RSS и число модулей при запуске '
+        'воркера с разными профилями настроек.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--settings-modules', nargs='+',
+            default=['api_yamdb.settings', 'api_yamdb.settings_api'],
+        )
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--top', type=int, default=5)
+
+    def handle(self, *args, **options):
+        for module in options['settings_modules']:
+            timings, rss, modules, log = [], [], 0, ''
+            for _ in range(options['runs']):
+                result = subprocess.run(
+                    [sys.executable, '-X', 'importtime', '-c', CHILD, module],
+                    cwd=settings.BASE_DIR, capture_output=True, text=True,
+                    check=True
+                )
+                elapsed, max_rss, modules = result.stdout.split()
+                timings.append(float(elapsed))
+                rss.append(int(max_rss))
+                log = result.stderr
+            startup_ms = statistics.median(timings) * 1000
+            self.stdout.write(
+                f'{module}: запуск {startup_ms:.0f} мс, '
+                f'RSS {statistics.median(rss) / 1024:.1f} МБ, '
+                f'модулей {modules}'
+            )
+            for cumulative, name in top_imports(log, options['top']):
+                self.stdout.write(f'    {cumulative / 1000:8.1f} мс  {name}')
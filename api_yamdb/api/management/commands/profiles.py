@@ -0,0 +1,70 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api_yamdb.profiling import ProfileStore
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает сохранённые профили запросов: без аргументов — список, '
+        'с id — самые долгие функции и SQL профиля.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('profile_id', nargs='?')
+        parser.add_argument('--top', type=int, default=20)
+        parser.add_argument(
+            '--path', help='Только профили запросов с этим началом пути.'
+        )
+
+    def list_profiles(self, store, path):
+        for profile_id in store.ids():
+            profile = store.load(profile_id)
+            if path and not profile['path'].startswith(path):
+                continue
+            self.stdout.write(
+                f'{profile_id}  {profile["duration_ms"]:9.1f} мс  '
+                f'SQL {profile["sql_count"]:4}  {profile["status"]}  '
+                f'{profile["method"]} {profile["path"]}'
+            )
+
+    def show_profile(self, profile, top):
+        started = datetime.fromtimestamp(profile['started'])
+        self.stdout.write(
+            f'{profile["method"]} {profile["path"]} → {profile["status"]}, '
+            f'{started:%Y-%m-%d %H:%M:%S}, причина: {profile["trigger"]}\n'
+            f'Время {profile["duration_ms"]:.1f} мс, сэмплов '
+            f'{profile["samples"]} с шагом {profile["interval_ms"]:g} мс, '
+            f'SQL: {profile["sql_count"]} запросов, '
+            f'{profile["sql_time_ms"]:.1f} мс'
+        )
+        samples = profile['samples'] or 1
+        self.stdout.write('\nФункции (% сэмплов в стеке / на вершине):')
+        for function in profile['functions'][:top]:
+            self.stdout.write(
+                f'{function["total"] / samples:7.1%} '
+                f'{function["own"] / samples:7.1%}  {function["function"]}'
+            )
+        self.stdout.write('\nSQL (суммарное время, число выполнений):')
+        for statement in profile['sql'][:top]:
+            self.stdout.write(
+                f'{statement["time_ms"]:9.1f} мс {statement["count"]:5}  '
+                f'{statement["sql"]}'
+            )
+
+    def handle(self, *args, **options):
+        store = ProfileStore(
+            settings.PROFILING_DIR,
+            settings.PROFILING_MAX_FILES,
+            settings.PROFILING_MAX_BYTES
+        )
+        if not options['profile_id']:
+            self.list_profiles(store, options['path'])
+            return
+        try:
+            profile = store.load(options['profile_id'])
+        except FileNotFoundError:
+            raise CommandError(f'Профиль {options["profile_id"]} не найден')
+        self.show_profile(profile, options['top'])
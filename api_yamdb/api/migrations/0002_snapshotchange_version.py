@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='snapshotchange',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
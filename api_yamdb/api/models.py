@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class SnapshotChange(models.Model):
+    """Изменение каталога, после которого нужно перестроить снимки.
+
+    key — группа снимков: categories, genres, titles (все списки
+    произведений) или title:<id> (списки, где есть это произведение).
+    version растёт при каждой повторной пометке группы.
+    """
+    key = models.CharField(max_length=100, unique=True)
+    version = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Изменение каталога'
+        verbose_name_plural = 'Изменения каталога'
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    PageNumberPagination,
+)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class RankKeysetPagination(BasePagination):
+    """Keyset-пагинация результатов поиска по релевантности.
+
+    Queryset должен быть аннотирован полем rank. Следующая страница
+    задаётся параметром after=<rank>:<id> последней записи предыдущей,
+    поэтому глубокие страницы не требуют OFFSET и COUNT по всей выдаче.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'after'
+    invalid_cursor_message = 'Неверный курсор'
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor is None:
+            return None
+        try:
+            rank, pk = cursor.split(':')
+            return float(rank), int(pk)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            rank, pk = cursor
+            queryset = queryset.filter(
+                Q(rank__lt=rank) | Q(rank=rank, pk__lt=pk)
+            )
+        page = list(queryset.order_by('-rank', '-pk')[:self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        page = page[:self.page_size]
+        self.last = page[-1] if page else None
+        return page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            f'{self.last.rank!r}:{self.last.pk}'
+        )
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Keyset-пагинация отзывов и комментариев от новых к старым."""
+    ordering = '-pub_date'
+
+
+class AnnotationFreeCountPaginator(Paginator):
+    """Paginator, считающий строки queryset без его аннотаций.
+
+    COUNT аннотированного queryset Django оборачивает в подзапрос и
+    вычисляет аннотации, например среднюю оценку, для каждой строки,
+    хотя на их число они не влияют.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list._chain()
+        queryset.query.annotations.clear()
+        queryset.query.set_annotation_mask(())
+        return queryset.count()
+
+
+class TitlePageNumberPagination(PageNumberPagination):
+    """Постраничный вывод произведений с дешёвым подсчётом числа строк."""
+    django_paginator_class = AnnotationFreeCountPaginator
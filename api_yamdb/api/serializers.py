@@ -3,6 +3,7 @@ from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
 from api_yamdb.settings import NAME_MAX_LENGTH, EMAIL_MAX_LENGTH
+from reviews.dictionaries import categories, genres
 from reviews.models import Category, Genre, Title, Review, Comment, User
 from reviews.validators import validate_year, check_username
 
@@ -62,9 +63,13 @@ class GenreSerializer(serializers.ModelSerializer):
 
 
 class TitleGetSerializer(serializers.ModelSerializer):
-    """Сериализатор для модели Title при GET запросах."""
-    genre = GenreSerializer(many=True)
-    category = CategorySerializer()
+    """Сериализатор для модели Title при GET запросах.
+
+    Жанры и категория берутся из справочников по id, для жанров
+    достаточно prefetch_related('genretitle_set').
+    """
+    genre = serializers.SerializerMethodField()
+    category = serializers.SerializerMethodField()
     rating = serializers.SerializerMethodField()
 
     class Meta:
@@ -75,21 +80,54 @@ class TitleGetSerializer(serializers.ModelSerializer):
         )
         read_only_fields = fields
 
+    def get_genre(self, data):
+        return genres.nested_list(
+            link.genre_id for link in data.genretitle_set.all()
+        )
+
+    def get_category(self, data):
+        return categories.nested(data.category_id)
+
     def get_rating(self, data):
         return data.score
 
 
+class TitleHistogramSerializer(TitleGetSerializer):
+    """TitleGetSerializer с гистограммой оценок 1–10 и медианой."""
+    histogram = serializers.ListField(
+        child=serializers.IntegerField(), read_only=True
+    )
+    median = serializers.SerializerMethodField()
+
+    class Meta(TitleGetSerializer.Meta):
+        fields = TitleGetSerializer.Meta.fields + ('histogram', 'median')
+        read_only_fields = fields
+
+    def get_median(self, data):
+        return data.score_percentile(50)
+
+
+class DictionarySlugField(serializers.SlugRelatedField):
+    """SlugRelatedField, который ищет slug в справочнике, а не в базе."""
+
+    def __init__(self, dictionary, **kwargs):
+        self.dictionary = dictionary
+        kwargs.setdefault('queryset', dictionary.model.objects.all())
+        super().__init__(slug_field='slug', **kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        instance = self.dictionary.instance(data)
+        if instance is None:
+            self.fail('does_not_exist', slug_name=self.slug_field, value=data)
+        return instance
+
+
 class TitlePostSerializer(serializers.ModelSerializer):
     """Сериализатор для модели Title при POST, PATCH, PUT, DELETE запросах."""
-    genre = serializers.SlugRelatedField(
-        many=True,
-        queryset=Genre.objects.all(),
-        slug_field='slug'
-    )
-    category = serializers.SlugRelatedField(
-        queryset=Category.objects.all(),
-        slug_field='slug'
-    )
+    genre = DictionarySlugField(genres, many=True)
+    category = DictionarySlugField(categories)
     year = serializers.IntegerField(validators=[validate_year])
 
     class Meta:
@@ -127,6 +165,14 @@ class ReviewSerializer(serializers.ModelSerializer):
         return data
 
 
+class ReviewSearchSerializer(ReviewSerializer):
+    """Сериализатор отзыва в общем поиске: с id произведения."""
+    title = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
+
+
 class CommentSerializer(serializers.ModelSerializer):
     """Сериализатор для модели Comment."""
     author = serializers.SlugRelatedField(
@@ -137,3 +183,58 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         fields = ('id', 'text', 'author', 'pub_date')
         model = Comment
+
+
+class TitleShortSerializer(serializers.ModelSerializer):
+    """Произведение в списках активности пользователя."""
+    class Meta:
+        model = Title
+        fields = ('id', 'name')
+
+
+class UserReviewSerializer(ReviewSerializer):
+    """Отзыв пользователя вместе с произведением."""
+    title = TitleShortSerializer(read_only=True)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
+
+
+class UserCommentSerializer(CommentSerializer):
+    """Комментарий пользователя вместе с отзывом и произведением."""
+    title = TitleShortSerializer(source='review.title', read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = ('id', 'title', 'review', 'text', 'author', 'pub_date')
+
+
+class BulkDeleteSerializer(serializers.Serializer):
+    """Условия массового удаления отзывов или комментариев.
+
+    В context['filters'] передаются условия, которые поддерживает модель:
+    остальные отклоняются, а не отбрасываются молча, иначе удаление
+    затронуло бы больше записей, чем просили.
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=1000,
+        allow_empty=False
+    )
+    author = serializers.SlugRelatedField(
+        queryset=User.objects.all(),
+        slug_field='username',
+        required=False
+    )
+    title = serializers.IntegerField(required=False)
+    review = serializers.IntegerField(required=False)
+
+    def validate(self, data):
+        supported = self.context.get('filters', data)
+        unsupported = [field for field in data if field not in supported]
+        if unsupported:
+            raise ValidationError({
+                field: 'Условие не поддерживается для этих записей.'
+                for field in unsupported
+            })
+        if 'ids' not in data and 'author' not in data:
+            raise ValidationError('Укажите ids или author.')
+        return data
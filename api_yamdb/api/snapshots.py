@@ -0,0 +1,289 @@
+import json
+import os
+import threading
+from contextlib import contextmanager, suppress
+from urllib.parse import urlencode, urlsplit
+
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.test import RequestFactory
+from django.urls import resolve
+
+from api_yamdb.middleware import compress_string
+from reviews.dictionaries import categories, genres
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+from .models import SnapshotChange
+
+API_PREFIX = '/api/v1/'
+MANIFEST = 'manifest.json'
+# Снимки сжимаются один раз при сборке, поэтому уровень максимальный
+GZIP_LEVEL = 9
+
+# Ключи изменений, см. SnapshotChange
+CATEGORIES = 'categories'
+GENRES = 'genres'
+TITLES = 'titles'
+TITLE = 'title:'
+
+
+# Ключи, собираемые внутри collect_changes текущего потока
+_collected = threading.local()
+
+
+def mark_changed(keys, using=None):
+    """Помечает группы снимков устаревшими в той же транзакции.
+
+    У уже помеченных групп растёт version: сборщик удаляет только
+    пометки, не изменившиеся с тех пор, как он их прочитал.
+    """
+    collected = getattr(_collected, 'keys', None)
+    if collected is not None:
+        collected.update(keys)
+        return
+    changes = SnapshotChange.objects.using(using)
+    changes.filter(key__in=keys).update(version=F('version') + 1)
+    changes.bulk_create(
+        [SnapshotChange(key=key) for key in keys], ignore_conflicts=True
+    )
+
+
+@contextmanager
+def collect_changes(using=None):
+    """Откладывает пометки сигналов до конца блока и пишет их разом.
+
+    Для массовых удалений и изменений: без блока каждая строка отзыва
+    давала бы два запроса к SnapshotChange. Блок должен стоять внутри
+    транзакции изменения, при исключении пометки не пишутся.
+    """
+    if getattr(_collected, 'keys', None) is not None:
+        yield
+        return
+    _collected.keys = set()
+    try:
+        yield
+        keys = _collected.keys
+    finally:
+        _collected.keys = None
+    if keys:
+        mark_changed(sorted(keys), using)
+
+
+@receiver(post_save, sender=Category, dispatch_uid='category_snapshots')
+@receiver(post_delete, sender=Category, dispatch_uid='category_snapshots')
+def category_changed(sender, raw=False, using=None, **kwargs):
+    # Категория выводится в каждом произведении
+    if not raw:
+        mark_changed([CATEGORIES, TITLES], using)
+
+
+@receiver(post_save, sender=Genre, dispatch_uid='genre_snapshots')
+@receiver(post_delete, sender=Genre, dispatch_uid='genre_snapshots')
+def genre_changed(sender, raw=False, using=None, **kwargs):
+    if not raw:
+        mark_changed([GENRES, TITLES], using)
+
+
+@receiver(post_save, sender=Title, dispatch_uid='title_snapshots')
+@receiver(post_delete, sender=Title, dispatch_uid='title_snapshots')
+def title_changed(sender, instance, raw=False, using=None, **kwargs):
+    if not raw:
+        mark_changed([f'{TITLE}{instance.pk}'], using)
+
+
+@receiver(post_save, sender=GenreTitle, dispatch_uid='genre_title_snapshots')
+@receiver(
+    post_delete, sender=GenreTitle, dispatch_uid='genre_title_snapshots'
+)
+@receiver(post_save, sender=Review, dispatch_uid='review_snapshots')
+@receiver(post_delete, sender=Review, dispatch_uid='review_snapshots')
+def title_part_changed(sender, instance, raw=False, using=None, **kwargs):
+    # Жанры и рейтинг произведения выводятся в списке произведений
+    if not raw:
+        mark_changed([f'{TITLE}{instance.title_id}'], using)
+
+
+@receiver(m2m_changed, sender=GenreTitle, dispatch_uid='genres_snapshots')
+def genres_changed(sender, instance, action, reverse, pk_set, using,
+                   **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        mark_changed([f'{TITLE}{instance.pk}'], using)
+    elif pk_set is None:
+        mark_changed([TITLES], using)
+    else:
+        mark_changed([f'{TITLE}{pk}' for pk in pk_set], using)
+
+
+def matches(params, slugs):
+    """Попадает ли произведение со slugs в выдачу фильтра params.
+
+    Фильтры TitlesFilter по slug категории и жанра — icontains.
+    """
+    return all(
+        any(value.lower() in slug.lower() for slug in slugs[field])
+        for field, value in params.items()
+    )
+
+
+class SnapshotBuilder:
+    """Снимки первых страниц списков каталога в JSON-файлах.
+
+    Страница рендерится вьюсетом API от имени анонимного пользователя и
+    лежит в каталоге по пути запроса под именем, равным строке запроса,
+    или index, если параметров нет:
+    /api/v1/titles/?category=movie&page=2 →
+    api/v1/titles/category=movie&page=2.json. Параметры упорядочены так
+    же, как в ссылках next и previous пагинации. Рядом лежит сжатая
+    копия .json.gz для gzip_static nginx.
+
+    manifest.json хранит для каждой группы файлы и id произведений в
+    них: по нему при изменении произведения перестраиваются только
+    группы, где оно было или должно появиться.
+    """
+
+    def __init__(self, directory, pages, base_url):
+        self.directory = directory
+        self.pages = pages
+        url = urlsplit(base_url)
+        # Абсолютные ссылки next и previous строятся от base_url
+        self.factory = RequestFactory(
+            HTTP_HOST=url.netloc, **{'wsgi.url_scheme': url.scheme}
+        )
+
+    def groups(self):
+        """Группы снимков: ключ → (путь, параметры фильтра)."""
+        groups = {
+            CATEGORIES: ('categories/', {}),
+            GENRES: ('genres/', {}),
+            TITLES: ('titles/', {}),
+        }
+        for field, model in (('category', Category), ('genre', Genre)):
+            for slug in model.objects.values_list('slug', flat=True):
+                groups[f'{TITLES}?{field}={slug}'] = (
+                    'titles/', {field: slug}
+                )
+        return groups
+
+    def affected(self, keys, manifest, groups):
+        """Группы, которые нужно перестроить после изменений keys."""
+        affected = set()
+        title_ids = set()
+        for key in keys:
+            if key == TITLES:
+                affected.update(
+                    group for group in groups if group.startswith(TITLES)
+                )
+            elif key.startswith(TITLE):
+                title_ids.add(int(key[len(TITLE):]))
+            else:
+                affected.add(key)
+        if not title_ids:
+            return affected & groups.keys()
+        affected.add(TITLES)
+        affected.update(
+            group for group, entry in manifest.items()
+            if title_ids.intersection(entry['titles'])
+        )
+        titles = Title.objects.filter(pk__in=title_ids).select_related(
+            'category'
+        ).prefetch_related('genre')
+        for title in titles:
+            slugs = {
+                'category': [title.category.slug] if title.category else [],
+                'genre': [genre.slug for genre in title.genre.all()],
+            }
+            affected.update(
+                group for group, (_, params) in groups.items()
+                if params and matches(params, slugs)
+            )
+        return affected & groups.keys()
+
+    def render(self, path, params):
+        request = self.factory.get(API_PREFIX + path, params)
+        match = resolve(request.path_info)
+        response = match.func(request, *match.args, **match.kwargs)
+        response.render()
+        return response
+
+    def build_group(self, path, params):
+        """Рендерит первые страницы группы, пока есть следующая."""
+        entry = {'files': [], 'titles': []}
+        for page in range(1, self.pages + 1):
+            query = {**params, 'page': page} if page > 1 else params
+            response = self.render(path, query)
+            if response.status_code != 200:
+                break
+            name = path + (urlencode(sorted(query.items())) or 'index')
+            self.write(name + '.json', response.content)
+            entry['files'].append(name + '.json')
+            if path.startswith(TITLES):
+                entry['titles'].extend(
+                    title['id'] for title in response.data['results']
+                )
+            if not response.data.get('next'):
+                break
+        return entry
+
+    def path(self, name):
+        return os.path.join(self.directory, API_PREFIX.strip('/'), name)
+
+    def write(self, name, content):
+        # nginx не должен увидеть недописанный файл
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        for suffix, data in (
+            ('', content), ('.gz', compress_string(content, GZIP_LEVEL))
+        ):
+            with open(path + suffix + '.tmp', 'wb') as file:
+                file.write(data)
+            os.replace(path + suffix + '.tmp', path + suffix)
+
+    def remove(self, names):
+        for name in names:
+            for suffix in ('', '.gz'):
+                with suppress(FileNotFoundError):
+                    os.remove(self.path(name) + suffix)
+
+    def load_manifest(self):
+        try:
+            with open(os.path.join(self.directory, MANIFEST)) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def save_manifest(self, manifest):
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + '.tmp', 'w') as file:
+            json.dump(manifest, file)
+        os.replace(path + '.tmp', path)
+
+    def build(self, keys=None):
+        """Перестраивает все снимки или только затронутые изменениями keys.
+
+        Возвращает число перестроенных групп.
+        """
+        # Снимок держится до следующего изменения каталога, поэтому названия
+        # категорий и жанров берутся из базы, а не из справочника процесса
+        categories.refresh()
+        genres.refresh()
+        manifest = self.load_manifest()
+        groups = self.groups()
+        if keys is None or manifest is None:
+            targets = groups.keys()
+            manifest = manifest or {}
+        else:
+            targets = self.affected(keys, manifest, groups)
+        # Группы удалённых и переименованных категорий и жанров
+        for group in set(manifest) - groups.keys():
+            self.remove(manifest.pop(group)['files'])
+        for group in targets:
+            entry = self.build_group(*groups[group])
+            if group in manifest:
+                self.remove(
+                    set(manifest[group]['files']) - set(entry['files'])
+                )
+            manifest[group] = entry
+        self.save_manifest(manifest)
+        return len(targets)
@@ -0,0 +1,82 @@
+from rest_framework import permissions
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Ограничение частоты запросов алгоритмом token bucket.
+
+    В кэше по ключу хранится пара (остаток токенов, время обновления), то
+    есть O(1) памяти на клиента вместо списка меток времени у
+    SimpleRateThrottle. Токены восстанавливаются равномерно со скоростью
+    rate, ведро вмещает столько запросов, сколько разрешено за период.
+
+    Чтение ведра (get) и запись остатка (set) не атомарны: параллельные
+    запросы одного клиента могут прочитать один и тот же остаток и
+    вместе потратить больше токенов, чем было в ведре.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        now = self.timer()
+        tokens, updated = self.cache.get(self.key, (self.num_requests, now))
+        tokens = min(
+            self.num_requests,
+            tokens + (now - updated) * self.num_requests / self.duration
+        )
+        if tokens < 1:
+            self.wait_time = (1 - tokens) * self.duration / self.num_requests
+            return False
+        self.cache.set(self.key, (tokens - 1, now), self.duration)
+        return True
+
+    def wait(self):
+        return self.wait_time
+
+
+class SignUpThrottle(TokenBucketThrottle):
+    """Ограничение запросов кода подтверждения по IP-адресу."""
+    scope = 'signup'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request)
+        }
+
+
+class TokenThrottle(SignUpThrottle):
+    """Ограничение запросов JWT-токена по IP-адресу."""
+    scope = 'token'
+
+
+class WriteThrottle(TokenBucketThrottle):
+    """Ограничение изменяющих запросов к вьюсету с атрибутом throttle_scope.
+
+    Ключ — id пользователя: к моменту проверки он уже аутентифицирован,
+    поэтому проверка не добавляет запросов к базе.
+    """
+
+    def __init__(self):
+        # Частота зависит от вьюсета и задаётся в allow_request.
+        pass
+
+    def allow_request(self, request, view):
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        self.scope = getattr(view, 'throttle_scope', None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
@@ -4,8 +4,10 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     CategoryViewSet,
     GenreViewSet,
+    ModerationViewSet,
     TitleViewSet,
     ReviewViewSet,
+    ReviewSearchViewSet,
     UserViewSet,
     CommentViewSet,
     signup,
@@ -28,6 +30,10 @@ router_v1.register(
     CommentViewSet,
     basename='comments'
 )
+router_v1.register(
+    r'search/reviews', ReviewSearchViewSet, basename='search-reviews'
+)
+router_v1.register(r'moderation', ModerationViewSet, basename='moderation')
 router_v1.register(r'users', UserViewSet, basename='users')
 
 auth_urls = [
@@ -1,40 +1,64 @@
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.db import IntegrityError
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from rest_framework import status, filters, mixins, permissions, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import (
+    action,
+    api_view,
+    permission_classes,
+    throttle_classes,
+)
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from .filters import TitlesFilter
+from .pagination import (
+    PubDateCursorPagination,
+    RankKeysetPagination,
+    TitlePageNumberPagination,
+)
 from .permissions import (
     IsAdminOnly,
     IsAdminOrReadOnly,
     AdminOrModeratorOrAuthoOrIsReadOnly,
 )
+from .row_serializers import (
+    CommentRowSerializer,
+    ReviewRowSerializer,
+    TitleRowSerializer,
+)
 from .serializers import (
+    BulkDeleteSerializer,
     CategorySerializer,
     GenreSerializer,
     TitleGetSerializer,
+    TitleHistogramSerializer,
     TitlePostSerializer,
     ReviewSerializer,
+    ReviewSearchSerializer,
     CommentSerializer,
     SignUpSerializer,
     TokenSerializer,
+    UserCommentSerializer,
+    UserReviewSerializer,
     UserSerializer,
 )
+from .snapshots import collect_changes
+from .throttling import SignUpThrottle, TokenThrottle, WriteThrottle
 from .utils import send_confirmation_code
 from reviews.models import (
-    Category, Genre, Title, Review, User
+    Category, Comment, Genre, Title, Review, User
 )
+from reviews.search import search
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([SignUpThrottle])
 def signup(request):
     """Вьюсет для отправки кода подтверждения при регистрации."""
     serializer = SignUpSerializer(data=request.data)
@@ -54,6 +78,12 @@ def signup(request):
             },
             status=status.HTTP_400_BAD_REQUEST
         )
+    if user.is_deleted:
+        # Учётная запись ждёт purge_deleted, имя и почта пока заняты
+        return Response(
+            {'message': 'Пользователь с таким именем удалён.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     confirmation_code = default_token_generator.make_token(user)
     send_confirmation_code(confirmation_code, email)
     return Response(
@@ -64,6 +94,7 @@ def signup(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([TokenThrottle])
 def token(request):
     """Вьюсет для отправки токена при регистрации."""
     serializer = TokenSerializer(data=request.data)
@@ -72,7 +103,7 @@ def token(request):
         'confirmation_code'
     )
     username = serializer.validated_data.get('username')
-    user = get_object_or_404(User, username=username)
+    user = get_object_or_404(User, username=username, is_deleted=False)
     if not default_token_generator.check_token(
         user,
         confirmation_code
@@ -81,6 +112,8 @@ def token(request):
             data={'error': 'Невалидный токен'},
             status=status.HTTP_400_BAD_REQUEST,
         )
+    from rest_framework_simplejwt.tokens import RefreshToken
+
     refresh = RefreshToken.for_user(user)
     return Response(
         data={'access': str(refresh.access_token)},
@@ -90,7 +123,7 @@ def token(request):
 
 class UserViewSet(viewsets.ModelViewSet):
     """Вьюсет для просмотра и изменения данных пользователей."""
-    queryset = User.objects.all()
+    queryset = User.objects.filter(is_deleted=False)
     serializer_class = UserSerializer
     permission_classes = (IsAdminOnly,)
     lookup_field = 'username'
@@ -115,6 +148,115 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer.save(role=request.user.role)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    def activity(self, queryset, serializer_class):
+        """Страница отзывов или комментариев пользователя.
+
+        Один запрос по индексу (author, -pub_date) вместе с произведением.
+        """
+        paginator = PubDateCursorPagination()
+        page = paginator.paginate_queryset(queryset, self.request, view=self)
+        return paginator.get_paginated_response(serializer_class(
+            page, many=True, context=self.get_serializer_context()
+        ).data)
+
+    def reviews_response(self, user):
+        return self.activity(
+            Review.objects.filter(
+                author=user, title__is_deleted=False
+            ).select_related('title', 'author'),
+            UserReviewSerializer
+        )
+
+    def comments_response(self, user):
+        return self.activity(
+            Comment.objects.filter(
+                author=user, review__title__is_deleted=False
+            ).select_related('review__title', 'author'),
+            UserCommentSerializer
+        )
+
+    @action(
+        detail=False,
+        url_path='me/reviews',
+        permission_classes=[IsAuthenticated]
+    )
+    def my_reviews(self, request):
+        return self.reviews_response(request.user)
+
+    @action(
+        detail=False,
+        url_path='me/comments',
+        permission_classes=[IsAuthenticated]
+    )
+    def my_comments(self, request):
+        return self.comments_response(request.user)
+
+    @action(detail=True)
+    def reviews(self, request, username=None):
+        return self.reviews_response(self.get_object())
+
+    @action(detail=True)
+    def comments(self, request, username=None):
+        return self.comments_response(self.get_object())
+
+    def perform_destroy(self, instance):
+        # Отзывы и комментарии удаляет пачками команда purge_deleted.
+        instance.is_deleted = True
+        instance.is_active = False
+        instance.save(update_fields=['is_deleted', 'is_active'])
+
+
+class FastListMixin:
+    """Быстрый list: ответ строится из values_list() без сериализаторов DRF.
+
+    Включается настройкой FAST_LIST_RENDERING, вывод совпадает с обычным.
+    """
+    fast_row_serializer = None
+
+    def fast_list_enabled(self):
+        return settings.FAST_LIST_RENDERING
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_list_enabled():
+            return super().list(request, *args, **kwargs)
+        rows = self.fast_row_serializer.values(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                self.fast_row_serializer.to_representation(page)
+            )
+        return Response(self.fast_row_serializer.to_representation(rows))
+
+
+class SearchMixin:
+    """Полнотекстовый поиск в list по параметру q.
+
+    Результаты упорядочены по релевантности и разбиты на страницы
+    RankKeysetPagination, без q список работает как обычно.
+    """
+    search_param = 'q'
+    search_required = False
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            if self.search_required:
+                raise ValidationError(
+                    {self.search_param: 'Укажите поисковый запрос.'}
+                )
+            return super().list(request, *args, **kwargs)
+        paginator = RankKeysetPagination()
+        page = paginator.paginate_queryset(
+            search(self.get_queryset().select_related('author'), query),
+            request,
+            view=self
+        )
+        return paginator.get_paginated_response(
+            self.get_serializer(page, many=True).data
+        )
+
 
 class ListCreateViewSet(mixins.CreateModelMixin, mixins.ListModelMixin,
                         mixins.DestroyModelMixin, viewsets.GenericViewSet):
@@ -130,6 +272,11 @@ class CategoryViewSet(ListCreateViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
+    def perform_destroy(self, instance):
+        # Одним UPDATE, не загружая произведения в память ради SET_NULL.
+        Title.all_objects.filter(category=instance).update(category=None)
+        instance.delete()
+
 
 class GenreViewSet(ListCreateViewSet):
     """Вьюсет для Genre."""
@@ -137,49 +284,136 @@ class GenreViewSet(ListCreateViewSet):
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(FastListMixin, viewsets.ModelViewSet):
     """Вьюсет для Title."""
-    queryset = Title.objects.all().annotate(score=Avg('reviews__score'))
+    queryset = Title.objects.with_score().prefetch_related('genretitle_set')
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitlesFilter
-    pagination_class = PageNumberPagination
+    pagination_class = TitlePageNumberPagination
     permission_classes = (IsAdminOrReadOnly,)
     ordering_fileds = '__all__'
     ordering = ('name',)
+    fast_row_serializer = TitleRowSerializer()
+    batch_max_size = 200
+
+    def with_histogram(self):
+        """Запрошена ли гистограмма оценок: ?histogram=true."""
+        return self.request.query_params.get('histogram') in ('true', '1')
+
+    def fast_list_enabled(self):
+        return super().fast_list_enabled() and not self.with_histogram()
 
     def get_serializer_class(self):
         if self.action in ("retrieve", "list"):
+            if self.with_histogram():
+                return TitleHistogramSerializer
             return TitleGetSerializer
         return TitlePostSerializer
 
+    def batch_ids(self):
+        """Уникальные id из параметра ids=1,2,3 в порядке запроса."""
+        try:
+            ids = [
+                int(pk)
+                for pk in self.request.query_params.get('ids', '').split(',')
+                if pk.strip()
+            ]
+        except ValueError:
+            raise ValidationError({'ids': 'id должны быть целыми числами.'})
+        if not ids:
+            raise ValidationError({'ids': 'Укажите id произведений.'})
+        if len(ids) > self.batch_max_size:
+            raise ValidationError(
+                {'ids': f'Не больше {self.batch_max_size} id за запрос.'}
+            )
+        return list(dict.fromkeys(ids))
+
+    @action(detail=False)
+    def batch(self, request):
+        """Произведения по списку id двумя запросами к базе.
+
+        Порядок совпадает с запрошенным, ненайденные id — в missing.
+        """
+        ids = self.batch_ids()
+        found = {
+            title['id']: title
+            for title in self.fast_row_serializer.to_representation(
+                self.fast_row_serializer.values(
+                    self.get_queryset().filter(pk__in=ids).order_by()
+                )
+            )
+        }
+        return Response({
+            'results': [found[pk] for pk in ids if pk in found],
+            'missing': [pk for pk in ids if pk not in found],
+        })
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    def perform_destroy(self, instance):
+        # Отзывы и комментарии удаляет пачками команда purge_deleted.
+        instance.is_deleted = True
+        instance.save(update_fields=['is_deleted'])
+
+
+class ReviewViewSet(SearchMixin, FastListMixin, viewsets.ModelViewSet):
     """Вьюсет для Review."""
     serializer_class = ReviewSerializer
+    fast_row_serializer = ReviewRowSerializer()
     pagination_class = PageNumberPagination
     permission_classes = [
         AdminOrModeratorOrAuthoOrIsReadOnly,
         permissions.IsAuthenticatedOrReadOnly
     ]
+    throttle_classes = (WriteThrottle,)
+    throttle_scope = 'reviews'
 
     def title_pk(self):
         return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
 
+    # Гистограмма оценок произведения меняется в той же транзакции, что и
+    # отзыв, через UPDATE ... SET score_N = score_N ± 1.
+
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.title_pk())
+        with transaction.atomic():
+            review = serializer.save(
+                author=self.request.user, title=self.title_pk()
+            )
+            Title.objects.filter(pk=review.title_id).shift_scores(
+                added=review.score
+            )
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            removed = Review.objects.select_for_update().values_list(
+                'score', flat=True
+            ).get(pk=serializer.instance.pk)
+            review = serializer.save()
+            Title.objects.filter(pk=review.title_id).shift_scores(
+                added=review.score, removed=removed
+            )
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            _, deleted = instance.delete()
+            if deleted.get(Review._meta.label):
+                Title.objects.filter(pk=instance.title_id).shift_scores(
+                    removed=instance.score
+                )
 
     def get_queryset(self):
         return self.title_pk().reviews.all()
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(SearchMixin, FastListMixin, viewsets.ModelViewSet):
     """Вьюсет для Comment."""
     serializer_class = CommentSerializer
+    fast_row_serializer = CommentRowSerializer()
     pagination_class = PageNumberPagination
     permission_classes = [
         AdminOrModeratorOrAuthoOrIsReadOnly,
         permissions.IsAuthenticatedOrReadOnly
     ]
+    throttle_classes = (WriteThrottle,)
+    throttle_scope = 'comments'
 
     def title_pk(self):
         return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
@@ -194,3 +428,68 @@ class CommentViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         return self.review_pk().comments.all()
+
+
+class ReviewSearchViewSet(SearchMixin, mixins.ListModelMixin,
+                          viewsets.GenericViewSet):
+    """Поиск по отзывам всех произведений."""
+    queryset = Review.objects.filter(title__is_deleted=False)
+    serializer_class = ReviewSearchSerializer
+    permission_classes = (AllowAny,)
+    search_required = True
+
+
+class ModerationViewSet(viewsets.ViewSet):
+    """Массовое удаление отзывов и комментариев одним запросом.
+
+    Права те же, что у DELETE одной записи: админ и модератор удаляют
+    любые записи, пользователь — только свои. Удаление идёт одним
+    запросом в транзакции, рейтинг и гистограмма затронутых произведений
+    пересчитываются после него один раз.
+    """
+    permission_classes = (IsAuthenticated,)
+    review_filters = {
+        'ids': 'pk__in', 'author': 'author', 'title': 'title_id'
+    }
+    comment_filters = {
+        'ids': 'pk__in', 'author': 'author', 'title': 'review__title_id',
+        'review': 'review_id',
+    }
+
+    def bulk_delete(self, request, model, filters):
+        serializer = BulkDeleteSerializer(
+            data=request.data, context={'filters': filters}
+        )
+        serializer.is_valid(raise_exception=True)
+        queryset = model.objects.filter(**{
+            lookup: serializer.validated_data[field]
+            for field, lookup in filters.items()
+            if field in serializer.validated_data
+        })
+        user = request.user
+        # Затронутые произведения помечаются для снимков одним запросом
+        with transaction.atomic(), collect_changes():
+            if (not (user.is_admin or user.is_moderator)
+                    and queryset.exclude(author=user).exists()):
+                raise PermissionDenied(
+                    'Можно удалять только свои отзывы и комментарии.'
+                )
+            title_ids = (
+                set(queryset.values_list('title_id', flat=True))
+                if model is Review else ()
+            )
+            _, deleted = queryset.delete()
+            if title_ids:
+                Title.all_objects.filter(pk__in=title_ids).refresh_rating()
+        return Response(
+            {'deleted': deleted.get(model._meta.label, 0)},
+            status=status.HTTP_200_OK
+        )
+
+    @action(detail=False, methods=['post'], url_path='reviews/delete')
+    def delete_reviews(self, request):
+        return self.bulk_delete(request, Review, self.review_filters)
+
+    @action(detail=False, methods=['post'], url_path='comments/delete')
+    def delete_comments(self, request):
+        return self.bulk_delete(request, Comment, self.comment_filters)
@@ -3,14 +3,52 @@ ASGI config for YaMDb project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
-For more information on this file, see
-https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
+Views of the project are synchronous (Django 2.2, DRF), so every request is
+run by the WSGI handler in a bounded thread pool. A single process thus
+keeps many slow requests in flight: while one thread waits for Postgres the
+event loop keeps accepting connections and other threads serve them. The
+pool size is set with ``ASGI_THREADS`` and also bounds the number of open
+database connections per process.
+
+Run with an ASGI server, e.g.::
+
+    GUNICORN_WORKER_CLASS=uvicorn gunicorn -c gunicorn.conf.py
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-from django.core.asgi import get_asgi_application
+from asgiref.sync import SyncToAsync
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('ASGI_THREADS', default=32)),
+    thread_name_prefix='asgi'
+)
+
+
+class ThreadedWsgiToAsgiInstance(WsgiToAsgiInstance):
+    """Запускает WSGI-приложение в общем пуле потоков, а не в одном потоке.
+
+    По умолчанию asgiref выполняет синхронный код в единственном потоке
+    (thread_sensitive=True), что сводит параллельность к нулю.
+    """
+
+    run_wsgi_app = SyncToAsync(
+        vars(WsgiToAsgiInstance)['run_wsgi_app'].func,
+        thread_sensitive=False,
+        executor=executor
+    )
+
+
+class ThreadedWsgiToAsgi(WsgiToAsgi):
+    async def __call__(self, scope, receive, send):
+        await ThreadedWsgiToAsgiInstance(self.wsgi_application)(
+            scope, receive, send
+        )
+
+
+application = ThreadedWsgiToAsgi(get_wsgi_application())
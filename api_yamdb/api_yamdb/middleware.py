@@ -0,0 +1,134 @@
+import random
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware, re_accepts_gzip
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import AuthenticationFailed
+
+from .profiling import Profiler, ProfileStore
+
+# wbits 16 + MAX_WBITS: заголовок и контрольная сумма gzip вместо zlib
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def compress_string(content, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(content) + compressor.flush()
+
+
+def compress_sequence(sequence, level):
+    """Сжимает поток частями, отдавая каждую часть сразу.
+
+    Z_SYNC_FLUSH после каждой части: клиент получает данные по мере
+    генерации, а не когда наберётся внутренний буфер компрессора.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    for item in sequence:
+        data = compressor.compress(item) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class ConfigurableGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware с порогом размера и уровнем сжатия из настроек.
+
+    GZIP_MIN_LENGTH — ответы короче не сжимаются и не получают
+    Vary: Accept-Encoding, у них одно представление для всех клиентов.
+    GZIP_LEVEL — уровень zlib от 1 до 9, выбран по bench_compression.
+    """
+
+    def process_response(self, request, response):
+        if (not response.streaming
+                and len(response.content) < settings.GZIP_MIN_LENGTH):
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if not re_accepts_gzip.search(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        ):
+            return response
+        if response.streaming:
+            response.streaming_content = compress_sequence(
+                response.streaming_content, settings.GZIP_LEVEL
+            )
+            del response['Content-Length']
+        else:
+            compressed = compress_string(response.content, settings.GZIP_LEVEL)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = 'gzip'
+        return response
+
+
+def is_admin(request):
+    """Админ ли автор запроса: по сессии или по JWT-токену."""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        from rest_framework_simplejwt.authentication import JWTAuthentication
+
+        try:
+            authenticated = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        if authenticated is None:
+            return False
+        user = authenticated[0]
+    return user.is_admin
+
+
+class ProfilingMiddleware:
+    """Профилирует запросы админа с заголовком X-Profile и случайную долю
+    PROFILING_SAMPLE_RATE остальных.
+
+    Результат — топ функций и SQL — сохраняется в PROFILING_DIR, его id
+    возвращается в заголовке X-Profile-Id, просмотр — команда profiles.
+    В процессе одновременно профилируется не больше одного запроса.
+    """
+    lock = threading.Lock()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.store = ProfileStore(
+            settings.PROFILING_DIR,
+            settings.PROFILING_MAX_FILES,
+            settings.PROFILING_MAX_BYTES
+        )
+
+    def trigger(self, request):
+        if request.META.get('HTTP_X_PROFILE'):
+            return 'header' if is_admin(request) else None
+        if random.random() < settings.PROFILING_SAMPLE_RATE:
+            return 'sample'
+        return None
+
+    def __call__(self, request):
+        trigger = self.trigger(request)
+        if trigger is None or not self.lock.acquire(blocking=False):
+            return self.get_response(request)
+        started = time.time()
+        try:
+            with Profiler(
+                settings.PROFILING_INTERVAL, settings.PROFILING_MAX_SAMPLES
+            ) as profiler:
+                response = self.get_response(request)
+        finally:
+            self.lock.release()
+        response['X-Profile-Id'] = self.store.save({
+            'trigger': trigger,
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'started': started,
+            **profiler.result(),
+        })
+        return response
@@ -0,0 +1,201 @@
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack, suppress
+
+from django.db import connections
+
+# Ограничения размера одного профиля
+SQL_MAX_LENGTH = 1000
+SQL_MAX_STATEMENTS = 100
+TOP_FUNCTIONS = 50
+
+
+def frame_name(code):
+    return f'{code.co_filename}:{code.co_firstlineno}({code.co_name})'
+
+
+class StackSampler:
+    """Сэмплирующий профайлер потока.
+
+    Фоновый поток раз в interval секунд снимает стек профилируемого
+    потока через sys._current_frames(). Код запроса не трассируется,
+    поэтому накладные расходы не зависят от числа вызовов функций.
+    """
+
+    def __init__(self, thread_id, interval, max_samples):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_samples = max_samples
+        self.samples = 0
+        self.own = Counter()
+        self.total = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while (not self._stop.wait(self.interval)
+               and self.samples < self.max_samples):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.own[frame_name(frame.f_code)] += 1
+            # Рекурсивная функция учитывается в сэмпле один раз
+            self.total.update({
+                frame_name(stack_frame.f_code)
+                for stack_frame in self.walk(frame)
+            })
+
+    @staticmethod
+    def walk(frame):
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def top(self, limit=TOP_FUNCTIONS):
+        """Функции по числу сэмплов, в которых они были в стеке."""
+        return [
+            {'function': name, 'total': total, 'own': self.own[name]}
+            for name, total in sorted(
+                self.total.items(),
+                key=lambda item: (-item[1], -self.own[item[0]])
+            )[:limit]
+        ]
+
+
+class QueryRecorder:
+    """Обёртка execute_wrapper: время и число выполнений каждого SQL."""
+
+    def __init__(self):
+        self.statements = {}
+        self.count = 0
+        self.time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.time += elapsed
+            sql = sql[:SQL_MAX_LENGTH]
+            if (sql in self.statements
+                    or len(self.statements) < SQL_MAX_STATEMENTS):
+                statement = self.statements.setdefault(sql, [0, 0.0])
+                statement[0] += 1
+                statement[1] += elapsed
+
+    def top(self):
+        """Запросы по суммарному времени."""
+        return [
+            {'sql': sql, 'count': count, 'time_ms': round(elapsed * 1000, 3)}
+            for sql, (count, elapsed) in sorted(
+                self.statements.items(), key=lambda item: -item[1][1]
+            )
+        ]
+
+
+class Profiler:
+    """Профилирует один вызов: стек потока и SQL всех подключений."""
+
+    def __init__(self, interval, max_samples):
+        self.sampler = StackSampler(
+            threading.get_ident(), interval, max_samples
+        )
+        self.queries = QueryRecorder()
+        self.stack = ExitStack()
+
+    def __enter__(self):
+        for connection in connections.all():
+            self.stack.enter_context(
+                connection.execute_wrapper(self.queries)
+            )
+        self.started = time.perf_counter()
+        self.sampler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.sampler.stop()
+        self.duration = time.perf_counter() - self.started
+        self.stack.close()
+
+    def result(self):
+        return {
+            'duration_ms': round(self.duration * 1000, 3),
+            'interval_ms': self.sampler.interval * 1000,
+            'samples': self.sampler.samples,
+            'functions': self.sampler.top(),
+            'sql_count': self.queries.count,
+            'sql_time_ms': round(self.queries.time * 1000, 3),
+            'sql': self.queries.top(),
+        }
+
+
+class ProfileStore:
+    """Профили в JSON-файлах каталога с ограничением числа и объёма.
+
+    Имя файла начинается с времени создания, при превышении лимитов
+    удаляются самые старые.
+    """
+
+    def __init__(self, directory, max_files, max_bytes):
+        self.directory = directory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+
+    def path(self, profile_id):
+        return os.path.join(self.directory, f'{profile_id}.json')
+
+    def save(self, profile):
+        os.makedirs(self.directory, exist_ok=True)
+        profile_id = (
+            time.strftime('%Y%m%d-%H%M%S') + '-' + uuid.uuid4().hex[:8]
+        )
+        profile['id'] = profile_id
+        temporary = self.path(profile_id) + '.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(profile, file, ensure_ascii=False)
+        os.replace(temporary, self.path(profile_id))
+        self.rotate()
+        return profile_id
+
+    def ids(self):
+        """id профилей от старых к новым."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            name[:-len('.json')] for name in os.listdir(self.directory)
+            if name.endswith('.json')
+        )
+
+    def rotate(self):
+        # В каталог пишут несколько воркеров: файл может исчезнуть между
+        # listdir и удалением.
+        sizes = {}
+        for profile_id in self.ids():
+            with suppress(FileNotFoundError):
+                sizes[profile_id] = os.path.getsize(self.path(profile_id))
+        ids = sorted(sizes)
+        total = sum(sizes.values())
+        while ids and (len(ids) > self.max_files or total > self.max_bytes):
+            oldest = ids.pop(0)
+            total -= sizes[oldest]
+            with suppress(FileNotFoundError):
+                os.remove(self.path(oldest))
+
+    def load(self, profile_id):
+        with open(self.path(profile_id)) as file:
+            return json.load(file)
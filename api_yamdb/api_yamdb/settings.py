@@ -23,18 +23,20 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
     'django_filters',
-    'reviews',
-    'api',
+    'reviews.apps.ReviewsConfig',
+    'api.apps.ApiConfig',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api_yamdb.middleware.ConfigurableGZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api_yamdb.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -75,6 +77,21 @@ DATABASES = {
 }
 
 
+# Cache
+# Общий для всех воркеров кэш (memcached) задаётся переменными окружения,
+# по умолчанию — локальная память процесса.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', default=''),
+    }
+}
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -104,10 +121,55 @@ REST_FRAMEWORK = {
         'rest_framework.pagination.PageNumberPagination'
     ),
     'PAGE_SIZE': 5,
+    # Ограничения частоты запросов (token bucket, счётчики в кэше)
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': os.getenv('THROTTLE_SIGNUP', default='5/hour'),
+        'token': os.getenv('THROTTLE_TOKEN', default='20/hour'),
+        'reviews': os.getenv('THROTTLE_REVIEWS', default='10/min'),
+        'comments': os.getenv('THROTTLE_COMMENTS', default='30/min'),
+    },
+    # Перед приложением стоит nginx: IP клиента берётся из X-Forwarded-For
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', default=1)),
 }
 
 AUTH_USER_MODEL = 'reviews.User'
 
+# Быстрая отрисовка списков titles/reviews/comments без сериализаторов DRF
+FAST_LIST_RENDERING = os.getenv('FAST_LIST_RENDERING', default='False') == 'True'
+
+# Сжатие ответов: порог в байтах и уровень zlib, см. bench_compression
+GZIP_MIN_LENGTH = int(os.getenv('GZIP_MIN_LENGTH', default=1024))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', default=3))
+
+# Профилирование запросов: заголовок X-Profile от админа или доля
+# PROFILING_SAMPLE_RATE всех запросов, см. api_yamdb.middleware
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', default=0))
+PROFILING_INTERVAL = float(os.getenv('PROFILING_INTERVAL', default=0.005))
+PROFILING_MAX_SAMPLES = int(os.getenv('PROFILING_MAX_SAMPLES', default=2000))
+PROFILING_DIR = os.getenv(
+    'PROFILING_DIR', default=os.path.join(BASE_DIR, 'profiles')
+)
+PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', default=200))
+PROFILING_MAX_BYTES = int(
+    os.getenv('PROFILING_MAX_BYTES', default=50 * 1024 * 1024)
+)
+
+# Снимки первых страниц каталога, отдаются nginx, см. api.snapshots.
+# SNAPSHOT_BASE_URL — адрес сайта для ссылок next и previous в снимках.
+SNAPSHOT_DIR = os.getenv(
+    'SNAPSHOT_DIR', default=os.path.join(BASE_DIR, 'snapshots')
+)
+SNAPSHOT_PAGES = int(os.getenv('SNAPSHOT_PAGES', default=3))
+SNAPSHOT_BASE_URL = os.getenv('SNAPSHOT_BASE_URL', default='http://127.0.0.1')
+
+# Справочники категорий и жанров в памяти процесса, см.
+# reviews.dictionaries: как часто сверять версию в общем кэше и когда
+# перезагружать без неё, в секундах.
+DICTIONARY_CHECK_INTERVAL = float(
+    os.getenv('DICTIONARY_CHECK_INTERVAL', default=1)
+)
+DICTIONARY_MAX_AGE = float(os.getenv('DICTIONARY_MAX_AGE', default=300))
+
 NAME_MAX_LENGTH = 150
 EMAIL_MAX_LENGTH = 254
 
@@ -135,6 +197,12 @@ STATIC_URL = '/static/'
 
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 
+# Имена с хэшем содержимого и сжатые копии .gz/.br, см. api_yamdb.storage
+STATICFILES_STORAGE = os.getenv(
+    'STATICFILES_STORAGE',
+    default='api_yamdb.storage.CompressedManifestStaticFilesStorage'
+)
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
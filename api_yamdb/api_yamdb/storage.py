@@ -0,0 +1,82 @@
+import gzip
+import io
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def gzip_compress(content):
+    # mtime=0: одинаковый файл при каждой сборке
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=9,
+                       mtime=0) as archive:
+        archive.write(content)
+    return buffer.getvalue()
+
+
+def brotli_compress(content):
+    return brotli.compress(content, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хэшем содержимого в имени и сжатыми копиями файлов.
+
+    При collectstatic рядом с текстовыми файлами кладутся .gz и, если
+    установлен пакет brotli, .br — nginx отдаёт их без сжатия на лету
+    (gzip_static). Копия не сохраняется, если она не меньше исходника.
+    """
+    compress_extensions = (
+        '.css', '.js', '.json', '.map', '.svg', '.txt', '.xml', '.yaml'
+    )
+    compress_min_size = 256
+    # До collectstatic нет ни манифеста, ни файлов в STATIC_ROOT: ссылки
+    # строятся без хэша вместо ошибки 500, см. stored_name.
+    manifest_strict = False
+
+    def compressors(self):
+        yield '.gz', gzip_compress
+        if brotli is not None:
+            yield '.br', brotli_compress
+
+    def compress(self, name):
+        if not name.endswith(self.compress_extensions):
+            return
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < self.compress_min_size:
+            return
+        for suffix, compress in self.compressors():
+            compressed = compress(content)
+            if len(compressed) >= len(content):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Файла нет в STATIC_ROOT, хэш посчитать не из чего
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        # CSS обрабатывается в несколько проходов, и имя с хэшем может
+        # поменяться: сжимаем окончательные версии после всех проходов.
+        hashed_files = {}
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_files[name] = hashed_name
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for name, hashed_name in hashed_files.items():
+            self.compress(name)
+            self.compress(hashed_name)
@@ -0,0 +1,61 @@
+"""Настройки gunicorn для продакшена.
+
+Все параметры переопределяются переменными окружения GUNICORN_*.
+Количество воркеров и потоков по умолчанию вычисляется из числа ядер.
+"""
+import gc
+import multiprocessing
+import os
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+
+cpu_count = multiprocessing.cpu_count()
+worker_mode = os.getenv('GUNICORN_WORKER_CLASS', default='gthread')
+worker_class = WORKER_CLASSES[worker_mode]
+
+# Синхронный воркер занят запросом целиком, поэтому их нужно больше ядер;
+# gthread и uvicorn ждут базу в потоках, им хватает воркера на ядро.
+if worker_mode == 'uvicorn':
+    wsgi_app = 'api_yamdb.asgi:application'
+    default_workers = cpu_count
+elif worker_mode == 'sync':
+    wsgi_app = 'api_yamdb.wsgi:application'
+    default_workers = cpu_count * 2 + 1
+else:
+    wsgi_app = 'api_yamdb.wsgi:application'
+    default_workers = cpu_count + 1
+
+bind = os.getenv('GUNICORN_BIND', default='0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', default=default_workers))
+threads = int(os.getenv(
+    'GUNICORN_THREADS', default=4 if worker_mode == 'gthread' else 1
+))
+
+# Приложение загружается в мастере до форка: импорт Django и проекта
+# делается один раз, а страницы памяти делятся между воркерами (copy-on-write).
+preload_app = os.getenv('GUNICORN_PRELOAD', default='True') == 'True'
+
+# Воркеры перезапускаются после max_requests запросов (с разбросом,
+# чтобы не перезапускаться одновременно), это ограничивает рост памяти.
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', default=1000))
+max_requests_jitter = int(
+    os.getenv('GUNICORN_MAX_REQUESTS_JITTER', default=100)
+)
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', default=30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', default=30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', default=5))
+
+accesslog = os.getenv('GUNICORN_ACCESSLOG')
+errorlog = '-'
+
+
+def when_ready(server):
+    # Объекты, загруженные до форка, переносятся в постоянное поколение GC:
+    # сборщик мусора в воркерах не трогает их и не копирует страницы памяти.
+    if preload_app:
+        gc.freeze()
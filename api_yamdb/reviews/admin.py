@@ -1,11 +1,84 @@
 from django.contrib import admin
+from django.contrib.admin.utils import get_fields_from_path
+from django.core.paginator import Paginator
+from django.db import connections, models, transaction
+from django.utils.functional import cached_property
+
+from api.snapshots import collect_changes
 
 from .models import Category, Genre, Title, GenreTitle, Review, Comment, User
 
+# Ниже этого числа строк оценка из статистики Postgres неточна и дешевле
+# посчитать COUNT(*) честно.
+ESTIMATED_COUNT_THRESHOLD = 100000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор с оценкой числа строк вместо COUNT(*) для больших таблиц.
+
+    Для списка без фильтров на Postgres берёт pg_class.reltuples — оценку,
+    которую поддерживает autovacuum.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if not queryset.query.where and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples FROM pg_class WHERE relname = %s',
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            if row and row[0] > ESTIMATED_COUNT_THRESHOLD:
+                return int(row[0])
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Админка для больших таблиц.
+
+    Количество строк оценивается, а поиск идёт точным совпадением по полям
+    search_fields: стандартный icontains (UPPER(...) LIKE) не использует
+    индексы. Поиск по числовым полям применяется, только если введено число.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        condition = models.Q()
+        for path in self.search_fields:
+            field = get_fields_from_path(self.model, path)[-1]
+            if (isinstance(field, (models.AutoField, models.IntegerField))
+                    and not term.isdigit()):
+                continue
+            condition |= models.Q(**{path: term})
+        if not condition:
+            return queryset.none(), False
+        return queryset.filter(condition), False
+
 
 class UserAdmin(admin.ModelAdmin):
     list_display = ('username', 'email')
 
+    # Отзывы пользователя удаляются каскадом мимо ReviewAdmin: рейтинг и
+    # гистограмма их произведений пересчитываются здесь.
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, User.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic(), collect_changes():
+            title_ids = set(Review.objects.filter(
+                author__in=queryset
+            ).values_list('title_id', flat=True))
+            super().delete_queryset(request, queryset)
+            Title.objects.filter(pk__in=title_ids).refresh_rating()
+
 
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ('name', 'slug')
@@ -19,31 +92,58 @@ class GenreAdmin(admin.ModelAdmin):
 
 class TitleAdmin(admin.ModelAdmin):
     list_display = ('pk', 'name', 'year', 'description', 'category')
+    list_select_related = ('category',)
     list_editable = ('name', 'year', 'description', 'category',)
     search_fields = ('name', 'description')
     list_filter = ('year', 'category')
     empty_value_display = '-пусто-'
 
 
-class GenreTitleAdmin(admin.ModelAdmin):
+class GenreTitleAdmin(LargeTableAdmin):
     list_display = ('genre', 'title')
-    list_editable = ('title',)
+    list_select_related = ('genre', 'title')
+    raw_id_fields = ('title',)
+    search_fields = ('title__id', 'genre__slug')
     empty_value_display = '-пусто-'
 
 
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(LargeTableAdmin):
     list_display = ('pk', 'title', 'text', 'author', 'score', 'pub_date')
-    list_editable = ('title', 'text', 'author', 'score',)
-    search_fields = ('text', 'title')
-    list_filter = ('pub_date', 'author', 'title', 'score')
+    list_editable = ('text', 'score',)
+    list_select_related = ('title', 'author')
+    raw_id_fields = ('title', 'author')
+    search_fields = ('id', 'title__id', 'author__username')
+    list_filter = ('pub_date', 'score')
     empty_value_display = '-пусто-'
 
+    # Правки из админки редки: вместо сдвига счётчиков, как во вьюсете,
+    # рейтинг и гистограмма затронутых произведений пересчитываются.
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if not change or {'score', 'title'} & set(form.changed_data):
+            Title.objects.filter(
+                pk__in={obj.title_id, form.initial.get('title', obj.title_id)}
+            ).refresh_rating()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        Title.objects.filter(pk=obj.title_id).refresh_rating()
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic(), collect_changes():
+            title_ids = set(queryset.values_list('title_id', flat=True))
+            super().delete_queryset(request, queryset)
+            Title.objects.filter(pk__in=title_ids).refresh_rating()
+
 
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(LargeTableAdmin):
     list_display = ('pk', 'text', 'review', 'pub_date', 'author')
-    list_editable = ('text', 'review', 'author')
-    search_fields = ('review',)
-    list_filter = ('author',)
+    list_editable = ('text',)
+    list_select_related = ('review', 'author')
+    raw_id_fields = ('review', 'author')
+    search_fields = ('id', 'review__id', 'author__username')
+    list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
 
 
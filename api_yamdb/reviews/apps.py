@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class ReviewsConfig(AppConfig):
     name = 'reviews'
+
+    def ready(self):
+        # Обработчики сигналов, поддерживающие поисковый индекс и
+        # справочники категорий и жанров
+        from . import dictionaries, search  # noqa: F401
@@ -0,0 +1,153 @@
+import time
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Category, Genre
+
+# by_id: id → (slug, name), by_slug: slug → id, position: id → номер в
+# порядке name
+State = namedtuple('State', 'version loaded by_id by_slug position')
+
+
+class Dictionary:
+    """Справочник модели в памяти процесса: id ↔ slug ↔ name.
+
+    Таблица загружается целиком при первом обращении. Запись в неё
+    меняет версию в общем кэше, остальные процессы сверяются с ней не
+    чаще раза в DICTIONARY_CHECK_INTERVAL секунд и перезагружают
+    справочник при расхождении. Раз в DICTIONARY_MAX_AGE секунд он
+    перезагружается в любом случае: так изменения доходят и при кэше в
+    памяти процесса, общем только для его потоков.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.cache_key = f'dictionary:{model._meta.label_lower}'
+        self.state = None
+        self.checked = 0
+
+    def shared_version(self):
+        version = cache.get(self.cache_key)
+        if version is None:
+            # Ключа нет после старта кэша или вытеснения из него
+            cache.add(self.cache_key, uuid.uuid4().hex, None)
+            return cache.get(self.cache_key)
+        return version
+
+    def load(self, rows, version):
+        """Заполняет справочник строками (id, slug, name) в порядке name."""
+        by_id = {pk: (slug, name) for pk, slug, name in rows}
+        self.state = State(
+            version,
+            time.monotonic(),
+            by_id,
+            {slug: pk for pk, (slug, _) in by_id.items()},
+            {pk: position for position, pk in enumerate(by_id)},
+        )
+        return self.state
+
+    def reload(self, version):
+        # Внутри транзакции видны незакоммиченные строки: справочник
+        # без версии перезагрузится при следующей сверке.
+        if connection.in_atomic_block:
+            version = None
+        return self.load(
+            self.model.objects.order_by('name', 'pk').values_list(
+                'pk', 'slug', 'name'
+            ),
+            version
+        )
+
+    def current(self, check=False):
+        state = self.state
+        now = time.monotonic()
+        if (state is not None
+                and now - state.loaded > settings.DICTIONARY_MAX_AGE):
+            state = None
+        if (state is not None and not check
+                and now - self.checked < settings.DICTIONARY_CHECK_INTERVAL):
+            return state
+        version = self.shared_version()
+        self.checked = now
+        if state is None or state.version != version:
+            return self.reload(version)
+        return state
+
+    def refresh(self):
+        """Перечитывает справочник из базы, не дожидаясь сверки версии."""
+        self.checked = time.monotonic()
+        return self.reload(self.shared_version())
+
+    def clear(self):
+        """Сбрасывает справочник процесса и версию в общем кэше."""
+        self.state = None
+        cache.set(self.cache_key, uuid.uuid4().hex, None)
+
+    def containing(self, pks):
+        state = self.current()
+        if state.by_id.keys() >= set(pks):
+            return state
+        # Внешний ключ указывает на запись, которой нет в справочнике
+        return self.refresh()
+
+    def nested(self, pk):
+        """{'name', 'slug'} записи, как у вложенного сериализатора."""
+        if pk is None:
+            return None
+        slug, name = self.containing([pk]).by_id[pk]
+        return {'name': name, 'slug': slug}
+
+    def nested_list(self, pks):
+        """Записи pks в порядке name."""
+        pks = list(pks)
+        state = self.containing(pks)
+        return [
+            {'name': state.by_id[pk][1], 'slug': state.by_id[pk][0]}
+            for pk in sorted(pks, key=state.position.get)
+        ]
+
+    def instance(self, slug):
+        """Экземпляр модели по slug без запроса к базе или None."""
+        state = self.current()
+        if slug not in state.by_slug:
+            # Запись могла появиться в другом процессе после сверки
+            state = self.current(check=True)
+        pk = state.by_slug.get(slug)
+        if pk is None:
+            return None
+        slug, name = state.by_id[pk]
+        values = {'id': pk, 'slug': slug, 'name': name}
+        # from_db принимает значения всех полей в порядке concrete_fields
+        fields = [field.attname for field in self.model._meta.concrete_fields]
+        return self.model.from_db(
+            self.model.objects.db, fields, [values[field] for field in fields]
+        )
+
+    def pks_containing(self, text):
+        """id записей, slug которых содержит text без учёта регистра."""
+        text = text.lower()
+        return [
+            pk for slug, pk in self.current().by_slug.items()
+            if text in slug.lower()
+        ]
+
+
+categories = Dictionary(Category)
+genres = Dictionary(Genre)
+
+
+@receiver(post_save, sender=Category, dispatch_uid='category_dictionary')
+@receiver(post_delete, sender=Category, dispatch_uid='category_dictionary')
+@receiver(post_save, sender=Genre, dispatch_uid='genre_dictionary')
+@receiver(post_delete, sender=Genre, dispatch_uid='genre_dictionary')
+def dictionary_changed(sender, **kwargs):
+    dictionary = categories if sender is Category else genres
+    dictionary.clear()
+    # Процессы, перезагрузившие справочник до коммита, увидят новую версию
+    transaction.on_commit(dictionary.clear)
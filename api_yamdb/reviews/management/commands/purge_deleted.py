@@ -0,0 +1,96 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from api.snapshots import collect_changes
+from reviews.models import Comment, GenreTitle, Review, Title, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет пачками отзывы и комментарии произведений и пользователей, '
+        'помеченных на удаление, затем сами записи, и пересчитывает '
+        'рейтинг и гистограмму оценок затронутых произведений.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--pause', type=float, default=0,
+            help='Пауза между пачками в секундах, чтобы не нагружать базу.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, проверяя помеченные записи.'
+        )
+        parser.add_argument('--interval', type=float, default=60)
+
+    def delete_in_batches(self, queryset, label):
+        """Удаляет строки queryset пачками, каждая — в своей транзакции."""
+        queryset = queryset.order_by()
+        total = queryset.count()
+        deleted = 0
+        while True:
+            ids = list(
+                queryset.values_list('pk', flat=True)[:self.batch_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic(), collect_changes():
+                queryset.model._base_manager.filter(pk__in=ids).delete()
+            deleted += len(ids)
+            self.stdout.write(f'{label}: {deleted}/{total}')
+            if self.pause:
+                time.sleep(self.pause)
+
+    def purge_title(self, title):
+        label = f'Произведение {title.pk}'
+        self.delete_in_batches(
+            Comment.objects.filter(review__title=title),
+            f'{label}, комментарии'
+        )
+        self.delete_in_batches(
+            Review.objects.filter(title=title), f'{label}, отзывы'
+        )
+        self.delete_in_batches(
+            GenreTitle.objects.filter(title=title), f'{label}, жанры'
+        )
+        Title.all_objects.filter(pk=title.pk).delete()
+        self.stdout.write(f'{label} удалено')
+
+    def purge_user(self, user):
+        label = f'Пользователь {user.username}'
+        title_ids = set(
+            Review.objects.filter(author=user).values_list(
+                'title_id', flat=True
+            )
+        )
+        self.delete_in_batches(
+            Comment.objects.filter(Q(author=user) | Q(review__author=user)),
+            f'{label}, комментарии'
+        )
+        self.delete_in_batches(
+            Review.objects.filter(author=user), f'{label}, отзывы'
+        )
+        User.objects.filter(pk=user.pk).delete()
+        Title.objects.filter(pk__in=title_ids).refresh_rating()
+        self.stdout.write(
+            f'{label} удалён, рейтинг пересчитан для '
+            f'{len(title_ids)} произведений'
+        )
+
+    def purge(self):
+        for title in Title.all_objects.filter(is_deleted=True):
+            self.purge_title(title)
+        for user in User.objects.filter(is_deleted=True):
+            self.purge_user(user)
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.pause = options['pause']
+        self.purge()
+        while options['loop']:
+            time.sleep(options['interval'])
+            self.purge()
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:03
+
+from django.db import migrations, models
+
+import reviews.operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        reviews.operations.AddIndexConcurrently(
+            model_name='comment',
+            index=models.Index(fields=['review', '-pub_date'], name='comment_review_pub_date_idx'),
+        ),
+        reviews.operations.AddIndexConcurrently(
+            model_name='review',
+            index=models.Index(fields=['title', '-pub_date'], name='review_title_pub_date_idx'),
+        ),
+        reviews.operations.AddIndexConcurrently(
+            model_name='review',
+            index=models.Index(fields=['title', 'score'], name='review_title_score_idx'),
+        ),
+        reviews.operations.AddIndexConcurrently(
+            model_name='title',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['name'], name='title_name_idx'),
+        ),
+        reviews.operations.AddIndexConcurrently(
+            model_name='title',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['year', 'name'], name='title_year_name_idx'),
+        ),
+        reviews.operations.AddIndexConcurrently(
+            model_name='title',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['category', 'name'], name='title_category_name_idx'),
+        ),
+    ]
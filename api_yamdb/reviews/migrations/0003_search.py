@@ -0,0 +1,106 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:06
+
+import re
+from collections import Counter
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+SEARCH_TABLES = ('reviews_review', 'reviews_comment')
+
+# Копия reviews.search.tokenize на момент миграции: код приложения может
+# измениться, а миграция должна давать тот же индекс.
+TERM_MAX_LENGTH = 100
+WORD_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return Counter(
+        word[:TERM_MAX_LENGTH] for word in WORD_RE.findall(text.lower())
+    )
+
+
+def create_search_index(apps, schema_editor):
+    """Postgres: триггер, заполнение tsvector и GIN-индекс.
+
+    На других СУБД заполняет инвертированный индекс SearchTerm.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        term_model = apps.get_model('reviews', 'SearchTerm')
+        for model_name in ('review', 'comment'):
+            model = apps.get_model('reviews', model_name)
+            for instance in model.objects.only('text').iterator():
+                term_model.objects.bulk_create(
+                    term_model(term=term, count=count, **{model_name: instance})
+                    for term, count in tokenize(instance.text).items()
+                )
+        return
+    for table in SEARCH_TABLES:
+        schema_editor.execute(
+            f'CREATE TRIGGER {table}_search_vector_update '
+            f'BEFORE INSERT OR UPDATE OF text ON {table} FOR EACH ROW '
+            f'EXECUTE PROCEDURE tsvector_update_trigger('
+            f"search_vector, 'pg_catalog.russian', text)"
+        )
+        schema_editor.execute(
+            f'UPDATE {table} '
+            f"SET search_vector = to_tsvector('pg_catalog.russian', text)"
+        )
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY {table}_search_idx '
+            f'ON {table} USING gin (search_vector)'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in SEARCH_TABLES:
+        schema_editor.execute(
+            f'DROP INDEX CONCURRENTLY IF EXISTS {table}_search_idx'
+        )
+        schema_editor.execute(
+            f'DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table}'
+        )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('reviews', '0002_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100, verbose_name='Слово')),
+                ('count', models.PositiveIntegerField(verbose_name='Число вхождений')),
+                ('comment', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='reviews.Comment')),
+                ('review', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='reviews.Review')),
+            ],
+            options={
+                'verbose_name': 'Слово поискового индекса',
+                'verbose_name_plural': 'Поисковый индекс',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='searchterm',
+            index=models.Index(fields=['term'], name='search_term_idx'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:13
+
+from django.db import migrations, models
+
+import reviews.operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('reviews', '0003_search'),
+    ]
+
+    operations = [
+        reviews.operations.AddIndexConcurrently(
+            model_name='comment',
+            index=models.Index(fields=['author', '-pub_date'], name='comment_author_pub_date_idx'),
+        ),
+        reviews.operations.AddIndexConcurrently(
+            model_name='review',
+            index=models.Index(fields=['author', '-pub_date'], name='review_author_pub_date_idx'),
+        ),
+    ]
@@ -1,6 +1,12 @@
+import math
+from itertools import accumulate
+
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from django.db.models import Avg, Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, NullIf, Round
 
 from api_yamdb.settings import NAME_MAX_LENGTH, EMAIL_MAX_LENGTH
 from .validators import validate_year, check_username
@@ -40,6 +46,11 @@ class User(AbstractUser):
         default=USER,
         verbose_name='Роль'
     )
+    is_deleted = models.BooleanField(
+        default=False,
+        db_index=True,
+        verbose_name='Удалён'
+    )
 
     @property
     def is_moderator(self):
@@ -90,6 +101,84 @@ class Genre(BaseCategoryGenre):
         verbose_name_plural = 'Жанры'
 
 
+SCORES = range(1, 11)
+
+
+def score_field(score):
+    """Имя поля Title со счётчиком отзывов с оценкой score."""
+    return f'score_{score}'
+
+
+class TitleQuerySet(models.QuerySet):
+    def refresh_rating(self):
+        """Пересчитывает рейтинг и гистограмму оценок одним UPDATE."""
+        # order_by(): сортировка по умолчанию попала бы в GROUP BY
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        return self.update(
+            rating=Subquery(
+                reviews.annotate(average=Round(Avg('score'))).values('average')
+            ),
+            **{
+                score_field(score): Coalesce(Subquery(
+                    reviews.filter(score=score).annotate(
+                        count=Count('pk')
+                    ).values('count')
+                ), 0)
+                for score in SCORES
+            }
+        )
+
+    def with_score(self):
+        """Добавляет среднюю оценку score коррелированным подзапросом.
+
+        В отличие от JOIN с отзывами и GROUP BY, сортировку по name с
+        LIMIT обслуживают индексы title_*_name_idx, а средняя считается
+        по review_title_score_idx только для строк страницы.
+        """
+        return self.annotate(score=Subquery(
+            Review.objects.filter(title=OuterRef('pk')).order_by().values(
+                'title'
+            ).annotate(average=Avg('score')).values('average'),
+            output_field=models.FloatField()
+        ))
+
+    def shift_scores(self, added=None, removed=None):
+        """Атомарно меняет счётчики гистограммы и рейтинг, не читая строки.
+
+        added — оценка появившегося отзыва, removed — исчезнувшего; при
+        изменении оценки передаются обе.
+        """
+        if added == removed:
+            return 0
+        counts = {score: F(score_field(score)) for score in SCORES}
+        if added is not None:
+            counts[added] += 1
+        if removed is not None:
+            counts[removed] -= 1
+        total = sum(counts.values())
+        return self.update(
+            # round(среднего), как в refresh_rating, в целых числах:
+            # (2 · сумма + n) div (2 · n) округляет половину вверх
+            rating=(
+                2 * sum(score * count for score, count in counts.items())
+                + total
+            ) / (2 * NullIf(total, 0)),
+            **{
+                score_field(score): counts[score]
+                for score in (added, removed) if score is not None
+            }
+        )
+
+
+class TitleManager(models.Manager.from_queryset(TitleQuerySet)):
+    """Менеджер по умолчанию: скрывает помеченные на удаление произведения."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
 class Title(models.Model):
     """Модель произведения, к которым пишут отзывы."""
     name = models.TextField(
@@ -123,15 +212,68 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Категория произведения',
     )
+    is_deleted = models.BooleanField(
+        default=False,
+        db_index=True,
+        verbose_name='Удалено'
+    )
+
+    objects = TitleManager()
+    all_objects = TitleQuerySet.as_manager()
 
     class Meta:
         ordering = ('name',)
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        # Список произведений сортируется по name, фильтруется по year и
+        # category и никогда не содержит помеченных на удаление.
+        indexes = [
+            models.Index(
+                fields=['name'],
+                name='title_name_idx',
+                condition=Q(is_deleted=False)
+            ),
+            models.Index(
+                fields=['year', 'name'],
+                name='title_year_name_idx',
+                condition=Q(is_deleted=False)
+            ),
+            models.Index(
+                fields=['category', 'name'],
+                name='title_category_name_idx',
+                condition=Q(is_deleted=False)
+            ),
+        ]
 
     def __str__(self):
         return self.name[:30]
 
+    @property
+    def histogram(self):
+        """Число отзывов с оценками от 1 до 10."""
+        return [getattr(self, score_field(score)) for score in SCORES]
+
+    def score_percentile(self, percent):
+        """Перцентиль оценок по гистограмме методом ближайшего ранга."""
+        histogram = self.histogram
+        total = sum(histogram)
+        if not total:
+            return None
+        rank = max(1, math.ceil(total * percent / 100))
+        for score, cumulative in zip(SCORES, accumulate(histogram)):
+            if cumulative >= rank:
+                return score
+        return None
+
+
+# Гистограмма оценок: десять счётчиков вместо подсчёта отзывов на запрос
+for score in SCORES:
+    Title.add_to_class(score_field(score), models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=f'Отзывов с оценкой {score}'
+    ))
+
 
 class GenreTitle(models.Model):
     """Модель для связи id Title и id Genre."""
@@ -155,6 +297,8 @@ class BaseReviewComment(models.Model):
         auto_now_add=True,
         verbose_name='Дата'
     )
+    # Поддерживается триггером в Postgres, см. reviews.search
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         abstract = True
@@ -180,6 +324,23 @@ class Review(BaseReviewComment):
     class Meta(BaseReviewComment.Meta):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
+        indexes = [
+            # Отзывы произведения по дате
+            models.Index(
+                fields=['title', '-pub_date'],
+                name='review_title_pub_date_idx'
+            ),
+            # Средняя оценка произведения только по индексу (index-only scan)
+            models.Index(
+                fields=['title', 'score'],
+                name='review_title_score_idx'
+            ),
+            # Отзывы пользователя по дате
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='review_author_pub_date_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['title', 'author'],
@@ -201,3 +362,44 @@ class Comment(BaseReviewComment):
     class Meta(BaseReviewComment.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            # Комментарии отзыва по дате
+            models.Index(
+                fields=['review', '-pub_date'],
+                name='comment_review_pub_date_idx'
+            ),
+            # Комментарии пользователя по дате
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='comment_author_pub_date_idx'
+            ),
+        ]
+
+
+class SearchTerm(models.Model):
+    """Инвертированный индекс слов отзывов и комментариев.
+
+    Заменяет tsvector и GIN-индекс на СУБД кроме Postgres, где таблица
+    остаётся пустой.
+    """
+    term = models.CharField(max_length=100, verbose_name='Слово')
+    count = models.PositiveIntegerField(verbose_name='Число вхождений')
+    review = models.ForeignKey(
+        Review,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name='search_terms'
+    )
+    comment = models.ForeignKey(
+        Comment,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name='search_terms'
+    )
+
+    class Meta:
+        verbose_name = 'Слово поискового индекса'
+        verbose_name_plural = 'Поисковый индекс'
+        indexes = [
+            models.Index(fields=['term'], name='search_term_idx'),
+        ]
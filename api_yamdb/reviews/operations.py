@@ -0,0 +1,46 @@
+from django.db.migrations import AddIndex
+
+
+class AddIndexConcurrently(AddIndex):
+    """Создаёт индекс без блокировки записи в таблицу (Postgres).
+
+    CREATE INDEX CONCURRENTLY нельзя выполнять в транзакции, поэтому
+    миграция с этой операцией должна быть объявлена с atomic = False.
+    На других СУБД индекс создаётся обычным образом.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.execute(
+                str(self.index.create_sql(model, schema_editor)).replace(
+                    'CREATE INDEX', 'CREATE INDEX CONCURRENTLY', 1
+                )
+            )
+        return None
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.execute(
+                'DROP INDEX CONCURRENTLY IF EXISTS %s'
+                % schema_editor.quote_name(self.index.name)
+            )
+        return None
+
+    def describe(self):
+        return 'Concurrently create index %s on field(s) %s of model %s' % (
+            self.index.name,
+            ', '.join(self.index.fields),
+            self.model_name,
+        )
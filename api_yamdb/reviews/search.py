@@ -0,0 +1,67 @@
+import re
+from collections import Counter
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import Count, F, FloatField, IntegerField, Sum, Value
+from django.db.models.functions import Cast
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Comment, Review, SearchTerm
+
+# Конфигурация to_tsvector: русские слова приводятся к основе русским
+# стеммером, латиница — английским. Совпадает с триггерами миграции 0003.
+SEARCH_CONFIG = 'russian'
+TERM_MAX_LENGTH = SearchTerm._meta.get_field('term').max_length
+
+WORD_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Слова текста в нижнем регистре с числом вхождений."""
+    return Counter(
+        word[:TERM_MAX_LENGTH] for word in WORD_RE.findall(text.lower())
+    )
+
+
+def build_terms(term_model, field, instance):
+    """Строки инвертированного индекса для отзыва или комментария."""
+    return [
+        term_model(term=term, count=count, **{field: instance})
+        for term, count in tokenize(instance.text).items()
+    ]
+
+
+def search(queryset, query):
+    """Отбирает из queryset записи со всеми словами запроса.
+
+    Добавляет аннотацию rank — релевантность, чем больше, тем выше.
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        search_query = SearchQuery(query, config=SEARCH_CONFIG)
+        # ts_rank возвращает real; в double precision значение без потерь
+        # проходит через курсор пагинации и сравнивается точно.
+        return queryset.filter(search_vector=search_query).annotate(rank=Cast(
+            SearchRank(F('search_vector'), search_query), FloatField()
+        ))
+    terms = list(tokenize(query))
+    if not terms:
+        return queryset.annotate(rank=Value(0, IntegerField())).none()
+    return queryset.filter(search_terms__term__in=terms).annotate(
+        matched=Count('search_terms'),
+        rank=Sum('search_terms__count'),
+    ).filter(matched=len(terms))
+
+
+@receiver(post_save, sender=Review, dispatch_uid='review_search_terms')
+@receiver(post_save, sender=Comment, dispatch_uid='comment_search_terms')
+def update_search_terms(sender, instance, raw=False, using=None, **kwargs):
+    """Обновляет инвертированный индекс записи; в Postgres — триггер."""
+    if raw or connections[using].vendor == 'postgresql':
+        return
+    field = sender._meta.model_name
+    SearchTerm.objects.using(using).filter(**{field: instance}).delete()
+    SearchTerm.objects.using(using).bulk_create(
+        build_terms(SearchTerm, field, instance)
+    )
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import Comment, Review, Title, User
+
+pytestmark = [
+    pytest.mark.skipif(
+        os.getenv('DB_TESTS') != 'True',
+        reason='Нужна база данных, запуск с DB_TESTS=True'
+    ),
+    pytest.mark.django_db,
+]
+
+
+@pytest.fixture
+def author():
+    author = User.objects.create(username='author', email='author@yamdb.ru')
+    other = User.objects.create(username='other', email='other@yamdb.ru')
+    for number in range(7):
+        title = Title.objects.create(name=f'Произведение {number}', year=2000)
+        review = Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5
+        )
+        Review.objects.create(title=title, author=other, text='Чужой', score=1)
+        Comment.objects.create(review=review, author=author, text='Ответ')
+    Title.objects.filter(name='Произведение 6').update(is_deleted=True)
+    return author
+
+
+def collect(client, url):
+    """Все записи по ссылкам next; число запросов к базе на страницу."""
+    results, queries = [], []
+    while url:
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200
+        results += response.json()['results']
+        queries.append(len(context))
+        url = response.json()['next']
+    return results, queries
+
+
+class TestActivity:
+
+    def test_my_reviews(self, author):
+        client = APIClient()
+        client.force_authenticate(author)
+        reviews, queries = collect(client, '/api/v1/users/me/reviews/')
+        assert len(reviews) == 6, (
+            'Должны вернуться отзывы автора, кроме удалённых произведений'
+        )
+        assert {review['author'] for review in reviews} == {'author'}
+        assert reviews[0]['title']['name'] == 'Произведение 5', (
+            'Отзывы должны идти от новых к старым вместе с произведением'
+        )
+        assert set(queries) == {1}, (
+            'Страница должна строиться одним запросом к базе'
+        )
+
+    def test_my_comments(self, author):
+        client = APIClient()
+        client.force_authenticate(author)
+        comments, queries = collect(client, '/api/v1/users/me/comments/')
+        assert len(comments) == 6
+        assert comments[0]['title']['name'] == 'Произведение 5'
+        assert set(queries) == {1}
+
+    def test_permissions(self, author):
+        client = APIClient()
+        assert client.get('/api/v1/users/me/reviews/').status_code == 401
+        client.force_authenticate(author)
+        assert client.get(
+            '/api/v1/users/other/reviews/'
+        ).status_code == 403, 'Чужую активность видит только админ'
+        admin = User.objects.create(
+            username='admin', email='admin@yamdb.ru', role=User.ADMIN
+        )
+        client.force_authenticate(admin)
+        response = client.get('/api/v1/users/author/comments/')
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 5
@@ -0,0 +1,76 @@
+import os
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.dictionaries import categories, genres
+from reviews.models import Category, Genre, GenreTitle, Title
+
+pytestmark = [
+    pytest.mark.skipif(
+        os.getenv('DB_TESTS') != 'True',
+        reason='Нужна база данных, запуск с DB_TESTS=True'
+    ),
+    pytest.mark.django_db,
+]
+
+
+@pytest.fixture
+def titles():
+    category = Category.objects.create(name='Фильмы', slug='movie')
+    genres = [
+        Genre.objects.create(name=f'Жанр {number}', slug=f'genre-{number}')
+        for number in range(3)
+    ]
+    titles = []
+    for number in range(20):
+        title = Title.objects.create(
+            name=f'Произведение {number}', year=2000, category=category
+        )
+        for genre in genres[:number % 4]:
+            GenreTitle.objects.create(title=title, genre=genre)
+        titles.append(title)
+    titles[0].is_deleted = True
+    titles[0].save()
+    return titles
+
+
+class TestBatch:
+
+    def test_batch(self, titles, settings):
+        # Справочники категорий и жанров загружаются один раз на процесс
+        settings.DICTIONARY_CHECK_INTERVAL = 60
+        categories.current()
+        genres.current()
+        client = APIClient()
+        ids = [title.pk for title in reversed(titles)] + [0]
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                '/api/v1/titles/batch/', {'ids': ','.join(map(str, ids))}
+            )
+        assert response.status_code == 200
+        assert len(context) == 2, (
+            'Число запросов не должно зависеть от числа произведений'
+        )
+        results = response.json()['results']
+        assert [title['id'] for title in results] == ids[:-2], (
+            'Произведения должны идти в порядке запроса'
+        )
+        assert response.json()['missing'] == [titles[0].pk, 0], (
+            'Удалённые и несуществующие id должны попасть в missing'
+        )
+        assert results[0] == client.get(
+            f'/api/v1/titles/{titles[-1].pk}/'
+        ).json(), 'Формат должен совпадать с GET /titles/{id}/'
+
+    def test_invalid(self, titles):
+        client = APIClient()
+        assert client.get('/api/v1/titles/batch/').status_code == 400
+        assert client.get(
+            '/api/v1/titles/batch/', {'ids': '1,x'}
+        ).status_code == 400
+        assert client.get(
+            '/api/v1/titles/batch/', {'ids': ','.join(['1'] * 201)}
+        ).status_code == 400, 'Число id в запросе должно быть ограничено'
@@ -0,0 +1,121 @@
+import os
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.dictionaries import categories, genres
+from reviews.models import Category, Genre, GenreTitle, Title, User
+
+pytestmark = [
+    pytest.mark.skipif(
+        os.getenv('DB_TESTS') != 'True',
+        reason='Нужна база данных, запуск с DB_TESTS=True'
+    ),
+    pytest.mark.django_db,
+]
+
+DICTIONARY_TABLES = ('"reviews_category"', '"reviews_genre"')
+
+
+@pytest.fixture
+def catalog(settings):
+    settings.DICTIONARY_CHECK_INTERVAL = 60
+    movie = Category.objects.create(name='Фильмы', slug='movie')
+    Category.objects.create(name='Книги', slug='book')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    action = Genre.objects.create(name='Боевик', slug='action')
+    title = Title.objects.create(name='Фильм', year=2000, category=movie)
+    GenreTitle.objects.create(title=title, genre=drama)
+    GenreTitle.objects.create(title=title, genre=action)
+    Title.objects.create(name='Без категории', year=2001)
+    categories.current()
+    genres.current()
+    return title
+
+
+def captured_tables(response_getter):
+    with CaptureQueriesContext(connection) as context:
+        response = response_getter()
+    return response, [
+        query['sql'] for query in context.captured_queries
+        if any(table in query['sql'] for table in DICTIONARY_TABLES)
+    ]
+
+
+class TestDictionaries:
+
+    @pytest.mark.parametrize('fast', (False, True))
+    def test_list(self, catalog, settings, fast):
+        settings.FAST_LIST_RENDERING = fast
+        response, queries = captured_tables(
+            lambda: APIClient().get('/api/v1/titles/')
+        )
+        assert not queries, (
+            'Список произведений не должен обращаться к таблицам категорий '
+            'и жанров'
+        )
+        title = response.json()['results'][1]
+        assert title['category'] == {'name': 'Фильмы', 'slug': 'movie'}
+        assert title['genre'] == [
+            {'name': 'Боевик', 'slug': 'action'},
+            {'name': 'Драма', 'slug': 'drama'},
+        ], 'Жанры должны идти в порядке названия'
+        assert response.json()['results'][0]['category'] is None
+
+    def test_filter(self, catalog):
+        for params, expected in (
+            ({'category': 'MOV'}, [catalog.pk]),
+            ({'genre': 'dra'}, [catalog.pk]),
+            ({'category': 'book'}, []),
+            ({'genre': 'unknown'}, []),
+        ):
+            response, queries = captured_tables(
+                lambda: APIClient().get('/api/v1/titles/', params)
+            )
+            assert not queries, 'Фильтр по slug не должен соединять таблицы'
+            assert [
+                title['id'] for title in response.json()['results']
+            ] == expected, f'Неверная выдача фильтра {params}'
+
+    def test_validation(self, catalog):
+        client = APIClient()
+        client.force_authenticate(User.objects.create(
+            username='admin', email='admin@yamdb.ru', role=User.ADMIN
+        ))
+        # Новая запись сразу попадает в справочник процесса
+        client.post('/api/v1/categories/', {'name': 'Музыка', 'slug': 'music'})
+        response = client.post('/api/v1/titles/', {
+            'name': 'Альбом', 'year': 2010,
+            'category': 'music', 'genre': ['drama'],
+        })
+        assert response.status_code == 201, response.json()
+        assert response.json()['category'] == 'music', (
+            'В ответе категория должна быть представлена slug'
+        )
+        assert response.json()['genre'] == ['drama']
+        instance = categories.instance('music')
+        assert (instance.name, instance.slug) == ('Музыка', 'music')
+        title = Title.objects.get(pk=response.json()['id'])
+        assert title.category.slug == 'music'
+        assert list(title.genre.values_list('slug', flat=True)) == ['drama']
+        response = client.post('/api/v1/titles/', {
+            'name': 'Альбом', 'year': 2010,
+            'category': 'unknown', 'genre': ['drama'],
+        })
+        assert response.status_code == 400
+        assert 'category' in response.json()
+
+    def test_shared_version(self, catalog, settings):
+        # Запись в другом процессе: строка меняется, версия в кэше тоже
+        Category.objects.filter(slug='movie').update(name='Кино')
+        assert categories.nested(catalog.category_id)['name'] == 'Фильмы', (
+            'Без смены версии справочник не перечитывается'
+        )
+        cache.set(categories.cache_key, 'other-process')
+        settings.DICTIONARY_CHECK_INTERVAL = 0
+        assert categories.nested(catalog.category_id)['name'] == 'Кино', (
+            'При смене версии в общем кэше справочник перезагружается'
+        )
@@ -0,0 +1,150 @@
+import os
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+from django.db.models import Count
+from rest_framework.test import APIClient
+
+from reviews.models import SCORES, Review, Title, User, score_field
+
+
+def title_with(histogram):
+    return Title(**{
+        score_field(score): count for score, count in zip(SCORES, histogram)
+    })
+
+
+class TestPercentile:
+
+    def test_median(self):
+        title = title_with([1, 0, 0, 0, 2, 0, 0, 0, 0, 7])
+        assert title.score_percentile(50) == 10
+        assert title.score_percentile(10) == 1
+        assert title.score_percentile(30) == 5
+
+    def test_empty(self):
+        assert title_with([0] * 10).score_percentile(50) is None, (
+            'У произведения без отзывов нет медианы'
+        )
+
+
+@pytest.fixture
+def title():
+    title = Title.objects.create(name='Фильм', year=2000)
+    for number in range(5):
+        user = User.objects.create(
+            username=f'user{number}', email=f'user{number}@yamdb.ru'
+        )
+        Review.objects.create(
+            title=title, author=user, text='Отзыв', score=number + 1
+        )
+    Title.objects.refresh_rating()
+    return title
+
+
+@pytest.mark.skipif(
+    os.getenv('DB_TESTS') != 'True',
+    reason='Нужна база данных, запуск с DB_TESTS=True'
+)
+@pytest.mark.django_db
+class TestHistogram:
+
+    def assert_consistent(self, title):
+        title.refresh_from_db()
+        counts = dict(
+            title.reviews.order_by().values_list('score').annotate(Count('pk'))
+        )
+        assert title.histogram == [counts.get(score, 0) for score in SCORES], (
+            'Гистограмма должна совпадать с оценками отзывов'
+        )
+        scores = list(title.reviews.values_list('score', flat=True))
+        assert title.rating == (
+            int((Decimal(sum(scores)) / len(scores)).quantize(
+                Decimal(1), ROUND_HALF_UP
+            )) if scores else None
+        ), 'Рейтинг должен совпадать со средней оценкой отзывов'
+
+    def test_review_changes(self, title):
+        self.assert_consistent(title)
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create(username='new', email='new@yamdb.ru')
+        )
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        response = client.post(url, {'text': 'Новый', 'score': 10})
+        assert response.status_code == 201
+        self.assert_consistent(title)
+        review_url = f'{url}{response.json()["id"]}/'
+        assert client.patch(review_url, {'score': 2}).status_code == 200
+        self.assert_consistent(title)
+        # Средняя 3.5: половина округляется вверх, как в refresh_rating
+        assert client.patch(review_url, {'score': 6}).status_code == 200
+        self.assert_consistent(title)
+        assert title.rating == 4
+        assert client.delete(review_url).status_code == 204
+        self.assert_consistent(title)
+
+    def test_serializer(self, title):
+        client = APIClient()
+        data = client.get(f'/api/v1/titles/{title.pk}/').json()
+        assert 'histogram' not in data, 'Гистограмма выводится по запросу'
+        data = client.get(
+            f'/api/v1/titles/{title.pk}/', {'histogram': 'true'}
+        ).json()
+        assert data['histogram'] == [1, 1, 1, 1, 1, 0, 0, 0, 0, 0]
+        assert data['median'] == 3
+
+    def test_admin_changes(self, title, admin_client):
+        url = '/admin/reviews/review/'
+        review = title.reviews.get(score=1)
+        response = admin_client.post(f'{url}{review.pk}/change/', {
+            'title': title.pk, 'author': review.author_id,
+            'text': review.text, 'score': 10,
+        })
+        assert response.status_code == 302
+        self.assert_consistent(title)
+        review = title.reviews.get(score=2)
+        response = admin_client.post(url, {
+            'form-TOTAL_FORMS': 1, 'form-INITIAL_FORMS': 1,
+            'form-0-id': review.pk, 'form-0-text': review.text,
+            'form-0-score': 9, '_save': 'Сохранить',
+        })
+        assert response.status_code == 302
+        assert title.reviews.filter(score=9).exists()
+        self.assert_consistent(title)
+        response = admin_client.post(
+            f'{url}{review.pk}/delete/', {'post': 'yes'}
+        )
+        assert response.status_code == 302
+        self.assert_consistent(title)
+        response = admin_client.post(url, {
+            'action': 'delete_selected', 'post': 'yes',
+            '_selected_action': list(
+                title.reviews.filter(score__lt=5).values_list('pk', flat=True)
+            ),
+        })
+        assert response.status_code == 302
+        self.assert_consistent(title)
+        assert title.rating == 8, (
+            'Рейтинг тоже пересчитывается после правок из админки'
+        )
+
+    def test_admin_user_delete(self, title, admin_client):
+        url = '/admin/reviews/user/'
+        user = User.objects.get(username='user4')
+        response = admin_client.post(
+            f'{url}{user.pk}/delete/', {'post': 'yes'}
+        )
+        assert response.status_code == 302
+        self.assert_consistent(title)
+        response = admin_client.post(url, {
+            'action': 'delete_selected', 'post': 'yes',
+            '_selected_action': list(User.objects.filter(
+                username__in=['user0', 'user1']
+            ).values_list('pk', flat=True)),
+        })
+        assert response.status_code == 302
+        self.assert_consistent(title)
+        assert title.histogram == [0, 0, 1, 1] + [0] * 6, (
+            'Отзывы удалённых пользователей не должны оставаться в гистограмме'
+        )
@@ -0,0 +1,129 @@
+import os
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import Category, Comment, Review, Title, User
+
+pytestmark = [
+    pytest.mark.skipif(
+        os.getenv('DB_TESTS') != 'True',
+        reason='Нужна база Postgres, запуск с DB_TESTS=True'
+    ),
+    pytest.mark.skipif(
+        connection.vendor != 'postgresql',
+        reason='Планы запросов и индексы проверяются только на Postgres'
+    ),
+    pytest.mark.django_db,
+]
+
+
+@pytest.fixture
+def seeded():
+    categories = Category.objects.bulk_create(
+        Category(name=f'Категория {number}', slug=f'category-{number}')
+        for number in range(10)
+    )
+    users = User.objects.bulk_create(
+        User(username=f'user{number}', email=f'user{number}@yamdb.ru')
+        for number in range(200)
+    )
+    titles = Title.objects.bulk_create(
+        Title(name=f'Произведение {number}', year=1950 + number % 70,
+              category=categories[number % 10])
+        for number in range(2000)
+    )
+    reviews = Review.objects.bulk_create(
+        Review(title=titles[number % 100], author=users[number // 100],
+               text='Отзыв', score=number % 10 + 1)
+        for number in range(10000)
+    )
+    Comment.objects.bulk_create(
+        Comment(review=reviews[number % 50], author=users[number % 200],
+                text='Комментарий')
+        for number in range(10000)
+    )
+    admin = User.objects.create(
+        username='admin', email='admin@yamdb.ru', role=User.ADMIN
+    )
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return {'title': titles[0], 'review': reviews[0],
+            'category': categories[0], 'user': users[0], 'admin': admin}
+
+
+def explained(url, user=None):
+    """Планы всех запросов, выполненных при GET url: [(sql, план)]."""
+    client = APIClient()
+    client.force_authenticate(user)
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, response.content
+    plans = []
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            cursor.execute('EXPLAIN ' + query['sql'])
+            plans.append((query['sql'], '\n'.join(
+                row[0] for row in cursor.fetchall()
+            )))
+    return plans
+
+
+class TestIndexes:
+
+    def assert_uses(self, plans, index):
+        assert any(index in plan for _, plan in plans), (
+            f'Запросы должны использовать индекс {index}, планы:\n'
+            + '\n\n'.join(plan for _, plan in plans)
+        )
+
+    @pytest.mark.parametrize('params, index', (
+        ('', 'title_name_idx'),
+        ('?year=1960', 'title_year_name_idx'),
+        ('?category=category-1', 'title_category_name_idx'),
+    ))
+    @pytest.mark.parametrize('fast', (False, True))
+    def test_titles(self, seeded, settings, params, index, fast):
+        settings.FAST_LIST_RENDERING = fast
+        plans = explained('/api/v1/titles/' + params)
+        self.assert_uses(plans, index)
+        # Средняя оценка считается только для строк страницы
+        self.assert_uses(plans, 'review_title_score_idx')
+        counts = [plan for sql, plan in plans if 'COUNT(*)' in sql]
+        assert counts and not any(
+            'reviews_review' in plan for plan in counts
+        ), f'Подсчёт произведений не должен читать отзывы:\n{counts}'
+
+    def test_reviews(self, seeded):
+        self.assert_uses(
+            explained(f'/api/v1/titles/{seeded["title"].pk}/reviews/'),
+            'review_title_pub_date_idx'
+        )
+
+    def test_comments(self, seeded):
+        self.assert_uses(
+            explained(
+                f'/api/v1/titles/{seeded["title"].pk}/reviews/'
+                f'{seeded["review"].pk}/comments/'
+            ),
+            'comment_review_pub_date_idx'
+        )
+
+    def test_author(self, seeded):
+        self.assert_uses(
+            explained('/api/v1/users/me/reviews/', seeded['user']),
+            'review_author_pub_date_idx'
+        )
+        self.assert_uses(
+            explained('/api/v1/users/me/comments/', seeded['user']),
+            'comment_author_pub_date_idx'
+        )
+
+    def test_users(self, seeded):
+        # Сортировку по username обслуживает индекс уникальности.
+        self.assert_uses(
+            explained('/api/v1/users/', seeded['admin']),
+            'reviews_user_username_key'
+        )
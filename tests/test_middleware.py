@@ -0,0 +1,55 @@
+import gzip
+import zlib
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from api_yamdb.middleware import ConfigurableGZipMiddleware
+
+
+def respond(response, accept_encoding='gzip, deflate'):
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+    return ConfigurableGZipMiddleware(lambda request: response)(request)
+
+
+class TestGZipMiddleware:
+
+    def test_small(self, settings):
+        settings.GZIP_MIN_LENGTH = 100
+        response = respond(HttpResponse(b'a' * 99))
+        assert not response.has_header('Content-Encoding'), (
+            'Ответы меньше GZIP_MIN_LENGTH не должны сжиматься'
+        )
+        assert not response.has_header('Vary')
+
+    def test_large(self, settings):
+        settings.GZIP_MIN_LENGTH = 100
+        content = b'{"results": []}' * 100
+        response = respond(HttpResponse(content))
+        assert response['Content-Encoding'] == 'gzip'
+        assert response['Vary'] == 'Accept-Encoding', (
+            'Сжатый ответ должен содержать Vary: Accept-Encoding'
+        )
+        assert gzip.decompress(response.content) == content
+        assert response['Content-Length'] == str(len(response.content))
+
+    def test_not_accepted(self, settings):
+        settings.GZIP_MIN_LENGTH = 100
+        response = respond(HttpResponse(b'a' * 1000), accept_encoding='br')
+        assert not response.has_header('Content-Encoding')
+        assert response['Vary'] == 'Accept-Encoding', (
+            'Vary нужен и несжатому ответу, иначе кэш отдаст его всем'
+        )
+
+    def test_streaming(self, settings):
+        chunks = [b'{"results": [', b'1, 2, 3' * 50, b']}']
+        response = respond(StreamingHttpResponse(iter(chunks)))
+        assert response['Content-Encoding'] == 'gzip'
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        received = []
+        for data in response.streaming_content:
+            received.append(decompressor.decompress(data))
+        assert received[:3] == chunks, (
+            'Каждая часть потока должна отдаваться клиенту сразу'
+        )
+        assert b''.join(received) == b''.join(chunks)
@@ -0,0 +1,116 @@
+import os
+
+import pytest
+from rest_framework.test import APIClient
+
+from reviews.models import Comment, Review, Title, User
+
+pytestmark = [
+    pytest.mark.skipif(
+        os.getenv('DB_TESTS') != 'True',
+        reason='Нужна база данных, запуск с DB_TESTS=True'
+    ),
+    pytest.mark.django_db,
+]
+
+
+@pytest.fixture
+def spam():
+    spammer = User.objects.create(username='spammer', email='spam@yamdb.ru')
+    author = User.objects.create(username='author', email='author@yamdb.ru')
+    titles = [
+        Title.objects.create(name=f'Произведение {number}', year=2000)
+        for number in range(3)
+    ]
+    for title in titles:
+        review = Review.objects.create(
+            title=title, author=author, text='Отзыв', score=8
+        )
+        Review.objects.create(
+            title=title, author=spammer, text='Спам', score=1
+        )
+        for _ in range(4):
+            Comment.objects.create(review=review, author=spammer, text='Спам')
+        Comment.objects.create(review=review, author=author, text='Ответ')
+    Title.objects.refresh_rating()
+    return {'spammer': spammer, 'author': author, 'titles': titles}
+
+
+def client_for(role):
+    client = APIClient()
+    client.force_authenticate(User.objects.create(
+        username=role, email=f'{role}@yamdb.ru', role=role
+    ))
+    return client
+
+
+class TestModeration:
+
+    def test_comments_by_author_on_title(self, spam):
+        response = client_for(User.MODERATOR).post(
+            '/api/v1/moderation/comments/delete/',
+            {'author': 'spammer', 'title': spam['titles'][0].pk},
+            format='json'
+        )
+        assert response.status_code == 200
+        assert response.json() == {'deleted': 4}
+        assert Comment.objects.filter(author=spam['spammer']).count() == 8
+        assert Comment.objects.filter(author=spam['author']).count() == 3
+
+    def test_reviews_refresh_rating(self, spam):
+        response = client_for(User.ADMIN).post(
+            '/api/v1/moderation/reviews/delete/', {'author': 'spammer'},
+            format='json'
+        )
+        assert response.json() == {'deleted': 3}
+        title = Title.objects.get(pk=spam['titles'][0].pk)
+        assert title.rating == 8, 'Рейтинг должен пересчитаться'
+        assert title.histogram == [0] * 7 + [1, 0, 0], (
+            'Гистограмма должна пересчитаться'
+        )
+
+    def test_permissions(self, spam):
+        client = APIClient()
+        client.force_authenticate(spam['author'])
+        ids = list(Comment.objects.values_list('pk', flat=True))
+        response = client.post(
+            '/api/v1/moderation/comments/delete/', {'ids': ids},
+            format='json'
+        )
+        assert response.status_code == 403, (
+            'Пользователь не может удалять чужие комментарии'
+        )
+        assert Comment.objects.count() == len(ids), (
+            'При отказе не должно удаляться ничего'
+        )
+        own = list(Comment.objects.filter(
+            author=spam['author']
+        ).values_list('pk', flat=True))
+        response = client.post(
+            '/api/v1/moderation/comments/delete/', {'ids': own},
+            format='json'
+        )
+        assert response.json() == {'deleted': 3}
+        assert client_for(User.USER).post(
+            '/api/v1/moderation/reviews/delete/', {}, format='json'
+        ).status_code == 400, 'Нужно указать ids или author'
+
+    def test_rejected_filters(self, spam):
+        client = client_for(User.ADMIN)
+        review = Review.objects.filter(author=spam['spammer']).first()
+        response = client.post(
+            '/api/v1/moderation/reviews/delete/',
+            {'author': 'spammer', 'review': review.pk}, format='json'
+        )
+        assert response.status_code == 400, (
+            'Условие, которого нет у отзывов, не должно отбрасываться молча'
+        )
+        assert 'review' in response.json()
+        response = client.post(
+            '/api/v1/moderation/comments/delete/',
+            {'ids': [], 'author': 'spammer'}, format='json'
+        )
+        assert response.status_code == 400, 'Пустой ids — ошибка запроса'
+        assert 'ids' in response.json()
+        assert Review.objects.filter(author=spam['spammer']).count() == 3
+        assert Comment.objects.filter(author=spam['spammer']).count() == 12
@@ -0,0 +1,31 @@
+import os
+import re
+
+from .conftest import infra_dir_path
+
+
+def snapshot_name_pattern():
+    """Регулярное выражение, по которому nginx берёт имя снимка из $args."""
+    with open(os.path.join(infra_dir_path, 'nginx', 'default.conf')) as file:
+        config = file.read()
+    block = re.search(
+        r'map \$args \$snapshot_name \{(.*?)\}', config, re.S
+    ).group(1)
+    return re.search(r'"~(.+)" \$args;', block).group(1)
+
+
+class TestNginx:
+
+    def test_snapshot_names(self):
+        pattern = snapshot_name_pattern()
+        for args in ('page=2', 'category=movie', 'genre=sci-fi&page=2'):
+            assert re.search(pattern, args), (
+                f'Запрос с параметрами {args} должен отдаваться из снимка'
+            )
+        for args in (
+            '../../../manifest', 'page=2/../../manifest', 'page=2.json',
+            '%2e%2e/manifest',
+        ):
+            assert not re.search(pattern, args), (
+                f'Параметры {args!r} не должны попадать в путь к файлу'
+            )
@@ -0,0 +1,71 @@
+import time
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from api_yamdb.middleware import ProfilingMiddleware
+from api_yamdb.profiling import Profiler, ProfileStore
+
+
+def busy(seconds):
+    finish = time.perf_counter() + seconds
+    while time.perf_counter() < finish:
+        pass
+
+
+class TestProfiler:
+
+    def test_sampler(self):
+        with Profiler(interval=0.001, max_samples=1000) as profiler:
+            busy(0.1)
+        result = profiler.result()
+        assert result['samples'] > 10
+        top = max(result['functions'], key=lambda function: function['own'])
+        assert top['function'].endswith('(busy)'), (
+            'Самой частой функцией на вершине стека должна быть busy'
+        )
+        assert top['own'] > result['samples'] / 2
+
+    def test_max_samples(self):
+        with Profiler(interval=0.001, max_samples=5) as profiler:
+            busy(0.05)
+        assert profiler.result()['samples'] == 5, (
+            'Число сэмплов должно ограничиваться max_samples'
+        )
+
+    def test_store_rotation(self, tmp_path):
+        store = ProfileStore(str(tmp_path), max_files=3, max_bytes=10 ** 6)
+        ids = [store.save({'number': number}) for number in range(5)]
+        assert store.ids() == sorted(ids)[2:], (
+            'Должны оставаться только самые новые профили'
+        )
+        store = ProfileStore(str(tmp_path), max_files=100, max_bytes=1)
+        store.save({'number': 5})
+        assert store.ids() == [], 'Объём каталога должен ограничиваться'
+
+
+class TestProfilingMiddleware:
+
+    def request(self, **headers):
+        middleware = ProfilingMiddleware(lambda request: HttpResponse('ok'))
+        return middleware(RequestFactory().get('/api/v1/titles/', **headers))
+
+    def test_sample_rate(self, settings, tmp_path):
+        settings.PROFILING_DIR = str(tmp_path)
+        settings.PROFILING_SAMPLE_RATE = 0
+        assert not self.request().has_header('X-Profile-Id')
+        settings.PROFILING_SAMPLE_RATE = 1
+        response = self.request()
+        profile = ProfileStore(str(tmp_path), 10, 10 ** 6).load(
+            response['X-Profile-Id']
+        )
+        assert profile['path'] == '/api/v1/titles/'
+        assert profile['trigger'] == 'sample'
+
+    def test_header_requires_admin(self, settings, tmp_path):
+        settings.PROFILING_DIR = str(tmp_path)
+        settings.PROFILING_SAMPLE_RATE = 0
+        response = self.request(HTTP_X_PROFILE='1')
+        assert not response.has_header('X-Profile-Id'), (
+            'Заголовок X-Profile от анонима не должен включать профилирование'
+        )
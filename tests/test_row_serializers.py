@@ -0,0 +1,89 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.row_serializers import (
+    CommentRowSerializer,
+    ReviewRowSerializer,
+    TitleRowSerializer,
+)
+from api.serializers import (
+    CommentSerializer,
+    ReviewSerializer,
+    TitleGetSerializer,
+)
+from reviews.dictionaries import categories, genres
+
+PUB_DATE = timezone.make_aware(datetime(2022, 5, 1, 12, 30, 15, 123456),
+                               timezone.utc)
+AUTHOR = SimpleNamespace(username='user name')
+
+
+@pytest.fixture
+def dictionaries():
+    categories.load([(1, 'movie', 'Фильмы')], categories.shared_version())
+    genres.load(
+        [(3, 'drama', 'Драма'), (2, 'action', 'Экшн')],
+        genres.shared_version()
+    )
+    yield
+    categories.state = genres.state = None
+
+
+def genre_links(*pks):
+    links = [SimpleNamespace(genre_id=pk) for pk in pks]
+    return SimpleNamespace(all=lambda: links)
+
+
+class TestFastSerializers:
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_titles(self, dictionaries):
+        titles = [
+            SimpleNamespace(id=1, name='Фильм "1"', year=1999, score=7.25,
+                            description='Описание', category_id=1,
+                            genretitle_set=genre_links(2, 3)),
+            SimpleNamespace(id=2, name='Книга', year=2001, score=None,
+                            description=None, category_id=None,
+                            genretitle_set=genre_links()),
+        ]
+        rows = [
+            (1, 'Фильм "1"', 1999, 7.25, 'Описание', 1),
+            (2, 'Книга', 2001, None, None, None),
+        ]
+        row_serializer = TitleRowSerializer()
+        fast = row_serializer.attach_genres(
+            [row_serializer.row_to_dict(row) for row in rows],
+            [(1, 2), (1, 3)]
+        )
+        assert [genre['slug'] for genre in fast[0]['genre']] == [
+            'drama', 'action'
+        ], 'Жанры должны идти в порядке названия'
+        assert self.render(fast) == self.render(
+            TitleGetSerializer(titles, many=True).data
+        ), 'Быстрый вывод произведений должен совпадать с TitleGetSerializer'
+
+    def test_reviews(self):
+        review = SimpleNamespace(id=3, text='Отзыв', author=AUTHOR, score=9,
+                                 pub_date=PUB_DATE)
+        row = (3, 'Отзыв', AUTHOR.username, 9, PUB_DATE)
+        assert self.render(
+            ReviewRowSerializer().to_representation([row])
+        ) == self.render(ReviewSerializer([review], many=True).data), (
+            'Быстрый вывод отзывов должен совпадать с ReviewSerializer'
+        )
+
+    def test_comments(self):
+        comment = SimpleNamespace(id=4, text='Комментарий', author=AUTHOR,
+                                  pub_date=PUB_DATE)
+        row = (4, 'Комментарий', AUTHOR.username, PUB_DATE)
+        assert self.render(
+            CommentRowSerializer().to_representation([row])
+        ) == self.render(CommentSerializer([comment], many=True).data), (
+            'Быстрый вывод комментариев должен совпадать с CommentSerializer'
+        )
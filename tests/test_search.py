@@ -0,0 +1,103 @@
+import os
+
+import pytest
+from django.db import connection
+from rest_framework.test import APIClient
+
+from reviews.models import Comment, Review, Title, User
+from reviews.search import search, tokenize
+
+db_tests = pytest.mark.skipif(
+    os.getenv('DB_TESTS') != 'True',
+    reason='Нужна база данных, запуск с DB_TESTS=True'
+)
+
+
+class TestTokenize:
+
+    def test_words(self):
+        assert tokenize('Саундтрек, САУНДТРЕК и soundtrack!') == {
+            'саундтрек': 2, 'и': 1, 'soundtrack': 1
+        }, 'Слова должны приводиться к нижнему регистру и считаться'
+
+
+@pytest.fixture
+def reviews():
+    users = [
+        User.objects.create(
+            username=f'user{number}', email=f'user{number}@yamdb.ru'
+        )
+        for number in range(12)
+    ]
+    title = Title.objects.create(name='Фильм', year=2000)
+    reviews = [
+        Review.objects.create(
+            title=title, author=user, score=5,
+            text='Отличный soundtrack' if number % 2 else 'Скучный сюжет'
+        )
+        for number, user in enumerate(users)
+    ]
+    # Дважды упомянутое слово поднимает отзыв выше остальных
+    best = reviews[0]
+    best.text = 'soundtrack, soundtrack и ещё раз soundtrack'
+    best.save()
+    Comment.objects.create(
+        review=best, author=users[1], text='Согласен про soundtrack'
+    )
+    return reviews
+
+
+@db_tests
+@pytest.mark.django_db
+class TestSearch:
+
+    def test_rank(self, reviews):
+        found = list(
+            search(Review.objects.all(), 'soundtrack').order_by('-rank')
+        )
+        assert len(found) == 7, 'Должны найтись все отзывы со словом'
+        assert found[0] == reviews[0], (
+            'Выше должен быть отзыв с большим числом вхождений'
+        )
+
+    def test_all_words(self, reviews):
+        assert search(
+            Review.objects.all(), 'отличный soundtrack'
+        ).count() == 6, 'Должны найтись отзывы, содержащие все слова'
+
+    def test_pagination(self, reviews):
+        client = APIClient()
+        url = '/api/v1/search/reviews/?q=soundtrack'
+        found = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            found += [review['id'] for review in response.json()['results']]
+            url = response.json()['next']
+        assert len(found) == len(set(found)) == 7, (
+            'Страницы поиска не должны терять и повторять отзывы'
+        )
+        assert found[0] == reviews[0].pk
+
+    def test_title_and_review(self, reviews):
+        client = APIClient()
+        title_id = reviews[0].title_id
+        response = client.get(f'/api/v1/titles/{title_id}/reviews/?q=сюжет')
+        assert len(response.json()['results']) == 5
+        response = client.get(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[0].pk}/comments/'
+            '?q=soundtrack'
+        )
+        assert len(response.json()['results']) == 1
+        assert client.get('/api/v1/search/reviews/').status_code == 400, (
+            'Общий поиск без q должен возвращать ошибку'
+        )
+
+    @pytest.mark.skipif(
+        connection.vendor != 'postgresql', reason='GIN-индекс есть в Postgres'
+    )
+    def test_index(self, reviews):
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = search(Review.objects.all(), 'soundtrack').explain()
+        assert 'reviews_review_search_idx' in plan, plan
@@ -0,0 +1,121 @@
+import os
+from io import StringIO
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from reviews.models import Comment, GenreTitle, Genre, Review, Title, User
+
+pytestmark = [
+    pytest.mark.skipif(
+        os.getenv('DB_TESTS') != 'True',
+        reason='Нужна база данных, запуск с DB_TESTS=True'
+    ),
+    pytest.mark.django_db,
+]
+
+
+@pytest.fixture
+def admin_client():
+    client = APIClient()
+    client.force_authenticate(User.objects.create(
+        username='admin', email='admin@yamdb.ru', role=User.ADMIN
+    ))
+    return client
+
+
+@pytest.fixture
+def deleted_user():
+    return User.objects.create(
+        username='gone', email='gone@yamdb.ru', is_deleted=True,
+        is_active=False
+    )
+
+
+class TestSoftDelete:
+
+    def test_title_destroy(self, admin_client):
+        title = Title.objects.create(name='Фильм', year=2000)
+        response = admin_client.delete(f'/api/v1/titles/{title.pk}/')
+        assert response.status_code == 204
+        assert Title.all_objects.filter(pk=title.pk, is_deleted=True).exists()
+        assert admin_client.get(
+            f'/api/v1/titles/{title.pk}/'
+        ).status_code == 404, 'Удалённое произведение не должно отдаваться'
+        assert admin_client.get(
+            f'/api/v1/titles/{title.pk}/reviews/'
+        ).status_code == 404
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 0
+
+    def test_user_destroy(self, admin_client):
+        User.objects.create(username='reader', email='reader@yamdb.ru')
+        response = admin_client.delete('/api/v1/users/reader/')
+        assert response.status_code == 204
+        assert User.objects.filter(
+            username='reader', is_deleted=True, is_active=False
+        ).exists()
+        assert admin_client.get(
+            '/api/v1/users/reader/'
+        ).status_code == 404, 'Удалённый пользователь не должен отдаваться'
+
+    def test_signup_deleted(self, deleted_user, mailoutbox):
+        response = APIClient().post(
+            '/api/v1/auth/signup/',
+            {'username': 'gone', 'email': 'gone@yamdb.ru'}
+        )
+        assert response.status_code == 400
+        assert not mailoutbox, (
+            'Удалённому пользователю не должен уходить код подтверждения'
+        )
+
+    def test_token_deleted(self, deleted_user):
+        response = APIClient().post('/api/v1/auth/token/', {
+            'username': 'gone',
+            'confirmation_code': default_token_generator.make_token(
+                deleted_user
+            ),
+        })
+        assert response.status_code == 404
+        assert 'access' not in response.json()
+
+    def test_purge(self, deleted_user):
+        author = User.objects.create(username='author', email='a@yamdb.ru')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        removed = Title.objects.create(name='Удалённое', year=2000)
+        GenreTitle.objects.create(title=removed, genre=genre)
+        kept = Title.objects.create(name='Оставшееся', year=2000)
+        for number in range(3):
+            review = Review.objects.create(
+                title=removed, text='Отзыв', score=5,
+                author=User.objects.create(
+                    username=f'reader{number}', email=f'r{number}@yamdb.ru'
+                )
+            )
+            Comment.objects.create(review=review, author=author, text='Да')
+        Review.objects.create(title=kept, author=author, text='Да', score=10)
+        spam = Review.objects.create(
+            title=kept, author=deleted_user, text='Спам', score=2
+        )
+        Comment.objects.create(review=spam, author=author, text='Ответ')
+        Title.objects.refresh_rating()
+        Title.objects.filter(pk=removed.pk).update(is_deleted=True)
+
+        stdout = StringIO()
+        call_command('purge_deleted', batch_size=2, stdout=stdout)
+        output = stdout.getvalue()
+        label = f'Произведение {removed.pk}, отзывы'
+        assert f'{label}: 2/3' in output and f'{label}: 3/3' in output, (
+            'Отзывы должны удаляться пачками по batch_size'
+        )
+        assert not Title.all_objects.filter(pk=removed.pk).exists()
+        assert not Review.objects.filter(title=removed).exists()
+        assert not GenreTitle.objects.filter(title=removed).exists()
+        assert not User.objects.filter(pk=deleted_user.pk).exists()
+        assert not Comment.objects.filter(review=spam).exists()
+        kept.refresh_from_db()
+        assert kept.rating == 10, 'Рейтинг пересчитывается без удалённых'
+        assert (kept.score_2, kept.score_10) == (0, 1), (
+            'Гистограмма пересчитывается без удалённых'
+        )
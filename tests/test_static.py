@@ -0,0 +1,37 @@
+import gzip
+import json
+import os
+
+from django.core.management import call_command
+from django.template.loader import render_to_string
+
+
+class TestStatic:
+
+    def test_collectstatic(self, settings, tmp_path):
+        settings.STATIC_ROOT = str(tmp_path)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        with open(tmp_path / 'staticfiles.json') as manifest:
+            hashed_name = json.load(manifest)['paths']['redoc.yaml']
+        assert hashed_name != 'redoc.yaml', (
+            'Имя файла статики должно содержать хэш содержимого'
+        )
+        with open(tmp_path / hashed_name, 'rb') as original, gzip.open(
+            tmp_path / f'{hashed_name}.gz'
+        ) as compressed:
+            assert compressed.read() == original.read(), (
+                'Рядом с файлом должна лежать его сжатая копия .gz'
+            )
+        assert not os.path.exists(
+            tmp_path / 'rest_framework/img/grid.png.gz'
+        ), 'Уже сжатые форматы (изображения) сжимать не нужно'
+        assert f'/static/{hashed_name}' in render_to_string('redoc.html'), (
+            'Документация должна ссылаться на файл с хэшем'
+        )
+
+    def test_before_collectstatic(self, settings, tmp_path):
+        settings.STATIC_ROOT = str(tmp_path)
+        assert '/static/redoc.yaml' in render_to_string('redoc.html'), (
+            'Без манифеста документация должна ссылаться на файл без хэша, '
+            'а не падать с ошибкой'
+        )
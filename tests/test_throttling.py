@@ -0,0 +1,87 @@
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from api.throttling import SignUpThrottle, TokenBucketThrottle, WriteThrottle
+
+
+class BucketThrottle(SignUpThrottle):
+    rate = '2/min'
+
+
+class BucketView(APIView):
+    permission_classes = (AllowAny,)
+    throttle_classes = (BucketThrottle,)
+
+    def get(self, request):
+        return Response()
+
+
+class WriteView(BucketView):
+    throttle_classes = (WriteThrottle,)
+    throttle_scope = 'reviews'
+
+    def post(self, request):
+        return Response()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(
+        TokenBucketThrottle, 'cache', LocMemCache('throttling', {})
+    )
+    monkeypatch.setattr(TokenBucketThrottle, 'timer', lambda self: now[0])
+    return now
+
+
+def request(view, method='get'):
+    return view.as_view()(getattr(APIRequestFactory(), method)('/'))
+
+
+class TestTokenBucketThrottle:
+
+    def test_limit(self, clock):
+        assert [request(BucketView).status_code for _ in range(2)] == [
+            200, 200
+        ], 'Полное ведро пропускает rate запросов подряд'
+        response = request(BucketView)
+        assert response.status_code == 429
+        assert response['Retry-After'] == '30', (
+            'Retry-After — время до появления одного токена'
+        )
+
+    def test_refill(self, clock):
+        for _ in range(2):
+            request(BucketView)
+        clock[0] += 15
+        response = request(BucketView)
+        assert response.status_code == 429
+        assert response['Retry-After'] == '15'
+        clock[0] += 15
+        assert request(BucketView).status_code == 200, (
+            'Токен восстанавливается за период / rate'
+        )
+        assert request(BucketView).status_code == 429
+        clock[0] += 3600
+        assert [request(BucketView).status_code for _ in range(3)] == [
+            200, 200, 429
+        ], 'Ведро не наполняется больше чем на rate запросов'
+
+    def test_write_skips_safe(self, clock):
+        limit, _ = WriteThrottle().parse_rate(
+            api_settings.DEFAULT_THROTTLE_RATES['reviews']
+        )
+        assert all(
+            request(WriteView).status_code == 200 for _ in range(limit * 2)
+        ), 'Безопасные методы не тратят токены'
+        assert all(
+            request(WriteView, 'post').status_code == 200
+            for _ in range(limit)
+        )
+        assert request(WriteView, 'post').status_code == 429
+        assert request(WriteView).status_code == 200